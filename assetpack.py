@@ -0,0 +1,124 @@
+"""
+Asset pack: the files of the asset directories in one archive, memory-mapped at startup and
+served to pygame as file objects reading straight from the mapping.
+
+File layout: MAGIC, a little-endian header length, a JSON header mapping each relative path
+to the offset and size of its data, then the data of every file.
+"""
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+
+MAGIC = b"PKAP"
+VERSION = 1
+PREAMBLE = struct.Struct("<4sHI")  # Magic, version, header length
+ALIGNMENT = 16
+
+class PackFile(io.RawIOBase):
+    """
+    Read-only, seekable file object over one entry of the pack, without copying it out of the mapping.
+    """
+    def __init__(self, view, name):
+        self.view = view
+        self.name = name
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.view[self.position:self.position + len(buffer)]
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.position = max(0, offset)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+
+class AssetPack:
+    """
+    An asset pack built by build_pack, memory-mapped.
+    """
+    # Packs already opened by path; None when there is no pack at that path
+    packs = {}
+    lock = threading.Lock()
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_length = PREAMBLE.unpack_from(self.buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} asset pack")
+        self.entries = json.loads(self.buffer[PREAMBLE.size:PREAMBLE.size + header_length])
+        self.view = memoryview(self.buffer)
+
+    @classmethod
+    def shared(cls, path):
+        if path not in cls.packs:
+            with cls.lock:
+                if path not in cls.packs:
+                    cls.packs[path] = cls(path) if os.path.exists(path) else None
+        return cls.packs[path]
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def open(self, name):
+        offset, size = self.entries[name]
+        return PackFile(self.view[offset:offset + size], name)
+
+    def listdir(self, directory):
+        prefix = directory.rstrip("/") + "/"
+        return [name[len(prefix):] for name in self.entries if name.startswith(prefix) and "/" not in name[len(prefix):]]
+
+
+def build_pack(directories, output_path):
+    """
+    Pack every file under the directories, keyed by its path relative to the working directory.
+    Returns the number of files packed.
+    """
+    names = sorted(os.path.relpath(os.path.join(dirpath, filename)).replace(os.sep, "/")
+                   for directory in directories
+                   for dirpath, _, filenames in os.walk(directory)
+                   for filename in filenames)
+    sizes = [os.path.getsize(name) for name in names]
+
+    # Data starts after the header, so lay it out until the header length stops changing
+    header_bytes = b""
+    while True:
+        offset = PREAMBLE.size + len(header_bytes)
+        entries = {}
+        for name, size in zip(names, sizes):
+            offset += -offset % ALIGNMENT
+            entries[name] = [offset, size]
+            offset += size
+        encoded_header = json.dumps(entries).encode("utf-8")
+        settled = len(encoded_header) == len(header_bytes)
+        header_bytes = encoded_header
+        if settled:
+            break
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "wb") as file:
+        file.write(PREAMBLE.pack(MAGIC, VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for name in names:
+            file.write(b"\0" * (entries[name][0] - file.tell()))
+            with open(name, "rb") as source:
+                file.write(source.read())
+    return len(names)
@@ -0,0 +1,94 @@
+import pygame
+import json
+import math
+import os
+import threading
+import numpy as np
+from registry import Assets
+from utils import open_resource, resource_exists
+from config import ATLAS_DIR
+
+# Key colors tried in turn until one is not used by any image of the atlas
+KEY_COLORS = [(255, 0, 255), (0, 255, 255), (1, 2, 3), (254, 1, 253)]
+
+class Atlas:
+    """
+    Images of one set (icons, sprites) packed into a few sheets by build_atlas. Sheets are
+    loaded and converted to the display format on first use and images are served as
+    subsurfaces of them, so blits are same-format copies.
+    Without a built atlas get() returns None and callers load the loose file instead.
+    """
+    def __init__(self, name, directory=ATLAS_DIR):
+        self.directory = directory
+        self.frames = {}
+        self.sheets = {}
+        self.lock = threading.Lock()
+        index_path = os.path.join(directory, f"{name}.json")
+        if resource_exists(index_path):
+            with open_resource(index_path) as file:
+                index = json.load(file)
+            self.colorkey = tuple(index["colorkey"])
+            self.sheet_files = index["sheets"]
+            self.frames = {int(id): frame for id, frame in index["frames"].items()}
+
+    def get(self, id):
+        frame = self.frames.get(id)
+        if frame is None:
+            return None
+        sheet, x, y, width, height = frame
+        return self.sheet(sheet).subsurface((x, y, width, height))
+
+    def sheet(self, index):
+        with self.lock:
+            sheet = self.sheets.get(index)
+            if sheet is None:
+                sheet = Assets.load(os.path.join(self.directory, self.sheet_files[index]), alpha=False)
+                sheet.set_colorkey(self.colorkey)
+                self.sheets[index] = sheet
+        return sheet
+
+
+def build_atlas(name, source_dir, groups, output_dir=ATLAS_DIR):
+    """
+    Pack source_dir/<id>.png into one sheet per group of ids, on a grid. Transparent pixels
+    become a key color that no image uses, so the sheets are opaque and blit with a colorkey.
+    - groups: Lists of ids, e.g. one per generation.
+    Returns the number of images packed.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    images = {id: pygame.image.load(os.path.join(source_dir, f"{id}.png")).convert_alpha()
+              for group in groups for id in group if os.path.exists(os.path.join(source_dir, f"{id}.png"))}
+
+    # Pick a key color that is not an opaque pixel of any image
+    used = set()
+    for image in images.values():
+        pixels = pygame.surfarray.pixels3d(image)[pygame.surfarray.pixels_alpha(image) >= 128]
+        used.update(map(tuple, np.unique(pixels, axis=0).tolist()))
+    colorkey = next(color for color in KEY_COLORS if color not in used)
+
+    index = {"colorkey": colorkey, "sheets": [], "frames": {}}
+    for group in groups:
+        group = [id for id in group if id in images]
+        if not group:
+            continue
+        cell_width = max(images[id].get_width() for id in group)
+        cell_height = max(images[id].get_height() for id in group)
+        columns = math.ceil(math.sqrt(len(group)))
+        rows = math.ceil(len(group) / columns)
+        sheet = pygame.Surface((columns * cell_width, rows * cell_height))
+        sheet.fill(colorkey)
+        sheet_index = len(index["sheets"])
+        for i, id in enumerate(group):
+            image = images[id]
+            x, y = (i % columns) * cell_width, (i // columns) * cell_height
+            opaque = image.copy()
+            pygame.surfarray.pixels3d(opaque)[pygame.surfarray.pixels_alpha(image) < 128] = colorkey
+            sheet.blit(opaque, (x, y))
+            index["frames"][str(id)] = [sheet_index, x, y, image.get_width(), image.get_height()]
+        sheet_file = f"{name}-{sheet_index + 1}.png"
+        pygame.image.save(sheet, os.path.join(output_dir, sheet_file))
+        index["sheets"].append(sheet_file)
+
+    with open(os.path.join(output_dir, f"{name}.json"), "w", encoding="utf-8") as file:
+        json.dump(index, file)
+    return len(images)
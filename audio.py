@@ -0,0 +1,109 @@
+import pygame
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from cache import LRUCache, sound_nbytes
+from utils import open_resource
+from config import AUDIO_CHANNELS, CRY_CACHE_BUDGET
+
+# Sound priorities: when every channel is busy, a sound takes over the lowest one not above its own
+KEYSTROKE, EFFECT, CRY, NAME_CALL = range(4)
+
+def load_sound(path):
+    with open_resource(path) as file:
+        return pygame.mixer.Sound(file=file)
+
+
+class AudioManager:
+    """
+    All game audio: sound effects loaded once, an LRU of decoded cries, a fixed pool of
+    mixer channels shared by priority, and music tracks read into memory in the background.
+    - channels: Number of mixer channels in the pool.
+    - cry_budget: Maximum size in bytes of the decoded cries kept.
+    """
+    def __init__(self, channels=AUDIO_CHANNELS, cry_budget=CRY_CACHE_BUDGET):
+        self.channel_count = channels
+        self.channels = []
+        self.priorities = []
+        self.started = []
+        self.plays = 0
+        self.effects = {}
+        self.cries = LRUCache(cry_budget, sound_nbytes)
+        self.tracks = {}  # Music file name -> future of its bytes
+        self.music_file = None
+        self.loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="music")
+
+    def init(self):
+        """Set up the channel pool, once the mixer is initialized."""
+        pygame.mixer.set_num_channels(self.channel_count)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+        self.priorities = [KEYSTROKE] * self.channel_count
+        self.started = [0] * self.channel_count
+
+    def effect(self, path):
+        sound = self.effects.get(path)
+        if sound is None:
+            sound = self.effects[path] = load_sound(path)
+        return sound
+
+    def cry(self, id):
+        """Decoded cry of a species. Safe to call from the prefetch thread."""
+        sound = self.cries.get(id)
+        if sound is None:
+            sound = self.cries.put(id, load_sound(os.path.join('assets/cries', f"{id}.ogg")))
+        return sound
+
+    def play(self, sound, priority):
+        """
+        Play a sound on a free channel, or on the busy channel with the lowest priority not above
+        this one, oldest first. The sound is dropped when every channel plays something more important.
+        """
+        if sound is None:
+            return None
+        if not self.channels:
+            self.init()
+        slot = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                slot = i
+                break
+            if self.priorities[i] <= priority and (slot is None or (self.priorities[i], self.started[i]) < (self.priorities[slot], self.started[slot])):
+                slot = i
+        if slot is None:
+            return None
+        self.plays += 1
+        self.priorities[slot] = priority
+        self.started[slot] = self.plays
+        self.channels[slot].play(sound)
+        return self.channels[slot]
+
+    def preload_music(self, *names):
+        """
+        Read these music files into memory in the background, and forget the other preloaded ones.
+        """
+        for name in names:
+            if name not in self.tracks:
+                self.tracks[name] = self.loader.submit(self.read_track, name)
+        for name in list(self.tracks):
+            if name not in names:
+                del self.tracks[name]
+
+    @staticmethod
+    def read_track(name):
+        with open_resource(f"assets/music/{name}") as file:
+            return file.read()
+
+    def load_music(self, name):
+        """
+        Replace the current music with a track, from memory when it was preloaded.
+        """
+        track = self.tracks.get(name) or self.loader.submit(self.read_track, name)
+        self.tracks[name] = track
+        pygame.mixer.music.stop()
+        pygame.mixer.music.unload()
+        # The file object has to stay alive while the music streams from it
+        self.music_file = io.BytesIO(track.result())
+        pygame.mixer.music.load(self.music_file, name)
+
+
+audio = AudioManager()
@@ -0,0 +1,39 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from registry import Assets
+from config import GENS
+
+class BackgroundManager:
+    """
+    Region backgrounds, converted to the display format once. The regions up and down from the
+    current one are prepared on a worker thread, so changing region only swaps the surface.
+    """
+    def __init__(self, generations=GENS):
+        self.generations = generations
+        self.loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backgrounds")
+        self.images = {}  # Generation -> future of its converted background
+
+    def load(self, generation):
+        return Assets.load(f"assets/background/{self.generations[generation]['bg']}", alpha=False)
+
+    def get(self, generation):
+        """
+        Background of a region, waiting for it if it is still being prepared and loading it here if it was not.
+        """
+        future = self.images.get(generation)
+        if future is None:
+            future = self.images[generation] = Future()
+            future.set_result(self.load(generation))
+        return future.result()
+
+    def preload(self, generation):
+        """
+        Prepare the backgrounds of the neighbouring regions and of the first one (for a restart)
+        in the background, and let the others go.
+        """
+        keep = {0, *range(max(0, generation - 1), min(len(self.generations), generation + 2))}
+        for neighbour in sorted(keep):
+            if neighbour not in self.images:
+                self.images[neighbour] = self.loader.submit(self.load, neighbour)
+        for other in list(self.images):
+            if other not in keep:
+                del self.images[other]
@@ -0,0 +1,234 @@
+"""
+Benchmarks of the startup, spawning and rendering hot paths, run without a window or sound.
+
+    python benchmark.py                          Run everything and print the timings
+    python benchmark.py --only draw_text         Run the benchmarks whose name contains draw_text
+    python benchmark.py --save baseline.json     Store the timings as a baseline
+    python benchmark.py --compare baseline.json  Fail if a median got slower than the baseline
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import render
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, FONTPATH, GENS, COMBOCOLOR1, COMBOCOLOR2, LIGHT_GRAY, BLACK
+from frames import FrameClock
+from fonts import Fonts
+from pokedex import load_pokedex
+
+# Runs a game until its first frame is on screen
+COLD_START_SCRIPT = """
+import os, runpy, pygame
+def first_frame(*args, **kwargs):
+    os._exit(0)
+pygame.display.flip = pygame.display.update = first_frame
+runpy.run_path("main.py", run_name="__main__")
+"""
+
+BENCHMARKS = {}
+
+def benchmark(repeat):
+    """
+    Register a benchmark. The decorated function sets up and returns the callable to time.
+    """
+    def register(setup):
+        BENCHMARKS[setup.__name__] = (setup, repeat)
+        return setup
+    return register
+
+def measure(run, repeat, warmup=3):
+    for _ in range(min(warmup, repeat)):
+        run()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples = np.array(samples)
+    return {
+        "runs": repeat,
+        "mean": float(samples.mean()),
+        "p50": float(np.percentile(samples, 50)),
+        "p90": float(np.percentile(samples, 90)),
+        "p99": float(np.percentile(samples, 99)),
+    }
+
+
+class Scene:
+    """
+    A GameSession on a dummy display with a Pokemon on screen, shared by the benchmarks.
+    """
+    session = None
+
+    @classmethod
+    def get(cls):
+        if cls.session is None:
+            from pokemon import Pokemon
+            from session import GameSession
+            pokemon_data = load_pokedex()
+            Pokemon.load_name_sounds()
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            cls.font = Fonts.get(FONTPATH, 30)
+            cls.large_font = Fonts.get("assets/font/MS PGothic.ttf", 92)
+            cls.session = GameSession(pokemon_data, screen, cls.font, FrameClock(), random.Random(0))
+            cls.session.unpause_game(cls.session.get_ticks(), False)
+            cls.session.spawn_pokemon()
+        return cls.session
+
+
+@benchmark(repeat=5)
+def cold_start():
+    def run():
+        subprocess.run([sys.executable, "-c", COLD_START_SCRIPT], check=True, capture_output=True)
+    return run
+
+@benchmark(repeat=50)
+def pokemon_init_cold():
+    from pokemon import Pokemon
+    session = Scene.get()
+    species = iter(random.Random(0).sample(session.pokemon_data[:GENS[-1]["indices"][1]], 53))
+    def run():
+        Pokemon.species_assets.clear()
+        Pokemon(next(species))
+    return run
+
+@benchmark(repeat=200)
+def pokemon_init_warm():
+    from pokemon import Pokemon
+    data = Scene.get().pokemon_data[24]
+    Pokemon(data)
+    return lambda: Pokemon(data)
+
+@benchmark(repeat=500)
+def draw_text():
+    session = Scene.get()
+    names = [data["name"]["english"].upper() for data in session.pokemon_data[:100]]
+    index = iter(range(10 ** 9))
+    return lambda: session.draw_text(session.screen, names[next(index) % len(names)], Scene.large_font, BLACK, 100, 100)
+
+@benchmark(repeat=200)
+def draw_text_uncached():
+    session = Scene.get()
+    def run():
+        render.text_cache.clear()
+        session.draw_text(session.screen, "PIKACHU", Scene.large_font, BLACK, 100, 100)
+    return run
+
+@benchmark(repeat=500)
+def draw_gradient_rect():
+    session = Scene.get()
+    rect = pygame.Rect(10, 10, 37 * 5, 34)
+    return lambda: session.draw_gradient_rect(session.screen, rect, COMBOCOLOR1, COMBOCOLOR2)
+
+@benchmark(repeat=200)
+def draw_gradient_rect_uncached():
+    session = Scene.get()
+    rect = pygame.Rect(10, 10, 37 * 5, 34)
+    def run():
+        render.gradient_cache.clear()
+        session.draw_gradient_rect(session.screen, rect, COMBOCOLOR1, COMBOCOLOR2)
+    return run
+
+@benchmark(repeat=500)
+def draw_rounded_rect():
+    session = Scene.get()
+    rect = pygame.Rect(200, 320, 420, 150)
+    return lambda: session.draw_rounded_rect(session.screen, rect, LIGHT_GRAY, radius=15, outline_color=BLACK)
+
+@benchmark(repeat=200)
+def draw_rounded_rect_uncached():
+    session = Scene.get()
+    rect = pygame.Rect(200, 320, 420, 150)
+    def run():
+        render.rounded_rect_cache.clear()
+        session.draw_rounded_rect(session.screen, rect, LIGHT_GRAY, radius=15, outline_color=BLACK)
+    return run
+
+@benchmark(repeat=500)
+def draw_timer_bar():
+    session = Scene.get()
+    elapsed = iter(range(10 ** 9))
+    return lambda: session.draw_timer_bar(session.screen, 200, 400, 400, 15, next(elapsed) % 9000, 9000)
+
+@benchmark(repeat=100)
+def update_caught_pokemon_surface():
+    session = Scene.get()
+    icon = session.current_pokemon.icon
+    rng = random.Random(0)
+    caught_pokemons = [(icon, rng.random() < 0.1, rng.random() < 0.3, rng.random() < 0.3) for _ in range(50)]
+    combo_indices = [(0, 5), (12, 27), (40, 44)]
+    def run():
+        session.caught_pokemons, session.combo_indices = caught_pokemons, combo_indices
+        session.update_caught_pokemon_surface()
+    return run
+
+@benchmark(repeat=300)
+def full_frame():
+    session = Scene.get()
+    session.typed_name = session.current_pokemon.name[:3]
+    session.add_message("Missed!")
+    def run():
+        session.dirty.restore(session.screen, session.bg_image)
+        session.update_time(session.get_ticks())
+        session.draw_game_elements(session.screen, Scene.large_font, 5000, session.bg_image)
+        session.display_messages(session.screen, Scene.font, BLACK, SCREEN_WIDTH)
+        session.draw_game_scores(session.screen, Scene.font)
+        session.draw_caught_pokemon_icons(session.screen)
+        session.dirty.flush()
+    return run
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print the change of each median against the baseline. Returns the names that got slower than the tolerance.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["p50"] / baseline[name]["p50"]
+        flag = "SLOWER" if ratio > tolerance else ""
+        print(f"{name:32} {baseline[name]['p50']:9.3f} -> {result['p50']:9.3f} ms  x{ratio:.2f} {flag}")
+        if ratio > tolerance:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Poke Typing hot paths.")
+    parser.add_argument("--only", help="run only the benchmarks whose name contains this")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the medians against a baseline")
+    parser.add_argument("--tolerance", type=float, default=1.2, help="slowdown ratio counted as a regression")
+    args = parser.parse_args()
+
+    pygame.init()
+    results = {}
+    print(f"{'benchmark':32} {'runs':>5} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9}  ms")
+    for name, (setup, repeat) in BENCHMARKS.items():
+        if args.only and args.only not in name:
+            continue
+        result = results[name] = measure(setup(), repeat)
+        print(f"{name:32} {repeat:5} {result['mean']:9.3f} {result['p50']:9.3f} {result['p90']:9.3f} {result['p99']:9.3f}")
+    pygame.quit()
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print(f"Slower than the baseline: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Build-time asset compiler.
+
+    python build_assets.py cards    Pre-render the Pokemon background cards into assets/cards
+    python build_assets.py pokedex  Compile the Pokemon data into data/pokedex.bin
+    python build_assets.py atlas    Pack the icons and sprites into sheets in assets/atlas
+    python build_assets.py names    Transcode the name calls into assets/name_calls
+    python build_assets.py pack     Pack the asset directories into data/assets.pack
+"""
+import argparse
+import json
+import os
+
+# Rendering needs a display for convert_alpha, but no window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from pokemon import Pokemon
+from pokedex import build_pokedex
+from atlas import build_atlas
+from assetpack import build_pack
+from sounds import build_name_calls
+from utils import bundled_asset_dirs
+from config import GENS, POKEMON_DATA_PATH, POKEDEX_PATH, ATLAS_DIR, ASSET_PACK_PATH, NAME_CALLS_DIR
+
+CARDS_DIR = "assets/cards"
+
+def load_data():
+    with open(POKEMON_DATA_PATH, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+def build_cards(output_dir=CARDS_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    pokemon_data = load_data()[:GENS[-1]["indices"][1]]
+    for data in pokemon_data:
+        card = Pokemon.render_bg_image(data["id"], data["name"]["japanese"], data["name"]["korean"])
+        pygame.image.save(card, os.path.join(output_dir, f"{data['id']}.png"))
+    print(f"Baked {len(pokemon_data)} cards into {output_dir}")
+
+def build_atlases(output_dir=ATLAS_DIR):
+    # One sheet per generation, so a game only loads the sheets of the regions it reaches
+    groups = [[data["id"] for data in load_data()[start:end]] for start, end in (gen["indices"] for gen in GENS)]
+    for name in ("icons", "sprites"):
+        count = build_atlas(name, f"assets/{name}", groups, output_dir)
+        print(f"Packed {count} {name} into {len(groups)} sheets in {output_dir}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-build runtime assets for Poke Typing.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    cards = commands.add_parser("cards", help="pre-render the Pokemon background cards")
+    cards.add_argument("--output", default=CARDS_DIR)
+    pokedex = commands.add_parser("pokedex", help="compile the Pokemon data into a memory-mappable Pokedex")
+    pokedex.add_argument("--output", default=POKEDEX_PATH)
+    atlas = commands.add_parser("atlas", help="pack the icons and sprites into sheets")
+    atlas.add_argument("--output", default=ATLAS_DIR)
+    names = commands.add_parser("names", help="transcode the name calls and write their manifest")
+    names.add_argument("--codec", choices=("ogg", "adpcm"), help="ogg needs ffmpeg; defaults to ogg when ffmpeg is found")
+    names.add_argument("--output", default=NAME_CALLS_DIR)
+    pack = commands.add_parser("pack", help="pack the asset directories into one memory-mapped file")
+    pack.add_argument("--output", default=ASSET_PACK_PATH)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    if args.command == "cards":
+        build_cards(args.output)
+    elif args.command == "pokedex":
+        count = build_pokedex(POKEMON_DATA_PATH, args.output)
+        print(f"Compiled {count} Pokemon into {args.output}")
+    elif args.command == "atlas":
+        build_atlases(args.output)
+    elif args.command == "names":
+        codec, count = build_name_calls("assets/names", args.output, args.codec)
+        print(f"Transcoded {count} name calls to {codec} in {args.output}")
+    elif args.command == "pack":
+        count = build_pack(bundled_asset_dirs(), args.output)
+        print(f"Packed {count} files into {args.output}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
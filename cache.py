@@ -0,0 +1,59 @@
+import pygame
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Least-recently-used mapping bounded by a total weight.
+    Safe to share between the frame thread and the prefetch worker.
+    - capacity: Maximum total weight kept in the cache.
+    - weigh: Function returning the weight of a value (defaults to 1 per entry).
+    """
+    def __init__(self, capacity, weigh=None):
+        self.capacity = capacity
+        self.weigh = weigh or (lambda value: 1)
+        self.entries = OrderedDict()
+        self.total_weight = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.entries:
+                return default
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+    def put(self, key, value):
+        weight = self.weigh(value)
+        with self.lock:
+            if key in self.entries:
+                self.total_weight -= self.entries.pop(key)[1]
+            self.entries[key] = (value, weight)
+            self.total_weight += weight
+
+            # Evict the oldest entries, but always keep the one just added
+            while self.total_weight > self.capacity and len(self.entries) > 1:
+                _, (_, old_weight) = self.entries.popitem(last=False)
+                self.total_weight -= old_weight
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_weight = 0
+
+
+def sound_nbytes(sound):
+    """Approximate size in bytes of a decoded pygame.mixer.Sound."""
+    frequency, size, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+
+def surface_nbytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
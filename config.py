@@ -2,9 +2,24 @@
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
+# Frame pacing
+TARGET_FPS = 60
+FRAME_BUDGET_MS = 1000 / TARGET_FPS
+FRAME_STATS_WINDOW = 300
+
+# Only redraw and update the parts of the screen that changed
+DIRTY_RECTS = False
+
+# Frame profiler overlay, toggled with F3 or started by setting POKE_PROFILE=1
+PROFILE_LOG = "frame_profile.jsonl"
+
 TRANSITION_TIME = 4500
 ARROW_TRANSITION_TIME = 2000
 
+# Pokemon idle animation intervals (ms)
+JIGGLE_INTERVAL = 110
+WALK_INTERVAL = 200
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -19,6 +34,21 @@ COMBOCOLOR2 = (255, 69, 0)
 # Font
 FONTPATH = "assets/font/Microsoft Sans Serif.ttf"
 
+# Pokemon data, and the compiled Pokedex built from it by build_assets.py
+POKEMON_DATA_PATH = "data/pokemon_data_updated.json"
+POKEDEX_PATH = "data/pokedex.bin"
+
+# Icon and sprite sheets packed by build_assets.py
+ATLAS_DIR = "assets/atlas"
+
+# Compressed name calls and their manifest, transcoded by build_assets.py
+NAME_CALLS_DIR = "assets/name_calls"
+
+# Asset pack built by build_assets.py, and the directories it holds
+ASSET_PACK_PATH = "data/assets.pack"
+PACKED_ASSET_DIRS = ["assets/atlas", "assets/background", "assets/balls", "assets/cards", "assets/cries", "assets/font",
+                     "assets/icons", "assets/music", "assets/name_calls", "assets/names", "assets/sounds", "assets/sprites", "assets/sugimori_mini"]
+
 # Pokemon Gens
 GENS = [
     {"id": 1,
@@ -48,12 +78,33 @@ GENS = [
   "music":"Forest.mp3"},
     ]
 
+# Memory budgets (bytes)
+NAME_SOUND_BUDGET = 32 * 1024 * 1024
+CRY_CACHE_BUDGET = 16 * 1024 * 1024
+SPECIES_ASSET_BUDGET = 64 * 1024 * 1024
+GRADIENT_CACHE_BUDGET = 16 * 1024 * 1024
+ROUNDED_RECT_CACHE_BUDGET = 8 * 1024 * 1024
+
+# Cache sizes (entries)
+TEXT_CACHE_SIZE = 256
+
+# Mixer channels shared by the sound effects, cries and name calls
+AUDIO_CHANNELS = 8
+
+# Sprite animations
+POKEMON_MAX_SCALE = 2.0
+BALL_MAX_SCALE = 4.0
+HALO_MAX_SCALE = 7.0
+SCALE_LADDER_STEPS = 32
+
 # Thresholds
 NOT_SHOW_NAME_TIME = 3000
 LEGENDARY_CUTOFF = 580
 NORMAL_POKEMON_CATCH_TIME = 9000
 LEGENDARY_POKEMON_CATCH_TIME = 4000
 PASS_MARK = 7
+LEGENDARY_SPAWN_WEIGHT = 1.0  # Relative chance of drawing a legendary, 1 is as likely as any other Pokemon
+AVOID_RECENT_SPAWNS = 0  # Redraw Pokemon that were among this many recent spawns
 MAX_MISTAKE = 5
 REWARD_MAP = {
             1: 100,
@@ -0,0 +1,28 @@
+import pygame
+import threading
+from utils import open_resource
+
+class Fonts:
+    """
+    Shared pygame.font.Font objects keyed by (path, size), so each TTF file is opened once per size.
+    """
+    fonts = {}
+    lock = threading.Lock()
+
+    @classmethod
+    def get(cls, path, size):
+        font = cls.fonts.get((path, size))
+        if font is None:
+            with cls.lock:
+                font = cls.fonts.get((path, size))
+                if font is None:
+                    font = cls.fonts[(path, size)] = pygame.font.Font(open_resource(path), size)
+        return font
+
+    @classmethod
+    def prewarm(cls, path, base_size, max_scale):
+        """
+        Load every size a scale animation can ask for, from base_size up to base_size * max_scale.
+        """
+        for size in range(base_size, int(base_size * max_scale) + 1):
+            cls.get(path, size)
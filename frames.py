@@ -0,0 +1,54 @@
+import pygame
+from collections import deque
+from config import TARGET_FPS, FRAME_BUDGET_MS, FRAME_STATS_WINDOW
+
+class FramePacer:
+    """
+    Cap the frame rate and watch how long each frame takes to build against the frame-time budget.
+    """
+    def __init__(self, target_fps=TARGET_FPS, budget_ms=FRAME_BUDGET_MS, window=FRAME_STATS_WINDOW):
+        self.clock = pygame.time.Clock()
+        self.target_fps = target_fps
+        self.budget_ms = budget_ms
+        self.frame_times = deque(maxlen=window)  # Work time of the recent frames, without the wait
+        self.frame_count = 0
+        self.over_budget_count = 0
+        self.worst_frame_time = 0
+
+    def tick(self):
+        """
+        Wait for the end of the frame. Returns the time since the previous frame in milliseconds.
+        """
+        delta = self.clock.tick(self.target_fps)
+        frame_time = self.clock.get_rawtime()
+        self.frame_times.append(frame_time)
+        self.frame_count += 1
+        self.worst_frame_time = max(self.worst_frame_time, frame_time)
+        if frame_time > self.budget_ms:
+            self.over_budget_count += 1
+        return delta
+
+    def get_fps(self):
+        return self.clock.get_fps()
+
+    def stats(self):
+        return {"frames": self.frame_count, "over_budget": self.over_budget_count,
+                "budget_ms": self.budget_ms, "worst_ms": self.worst_frame_time}
+
+    def summary(self):
+        return f"{self.over_budget_count} of {self.frame_count} frames over the {self.budget_ms:.1f} ms budget, worst {self.worst_frame_time} ms"
+
+
+class FrameClock:
+    """
+    The game clock, read once per frame so everything in a frame sees the same time.
+    Replays advance it to the recorded frame times instead.
+    """
+    def __init__(self, now=None):
+        self.now = pygame.time.get_ticks() if now is None else now
+
+    def advance(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
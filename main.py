@@ -1,138 +1,194 @@
 import pygame
-import json
+import argparse
+import random
 from pokemon import Pokemon
+from pokedex import load_pokedex
 from session import GameSession
-from config import SCREEN_HEIGHT, SCREEN_WIDTH, WHITE, BLACK, FONTPATH, TRANSITION_TIME
-from utils import resource_path
-
-# Initialize Pygame
-pygame.init()
-
-# Load JSON data
-with open(resource_path("data/pokemon_data_updated.json"), "r", encoding="utf-8") as file:
-    pokemon_data = json.load(file)
-
-# Load all name sounds into memory
-Pokemon.load_name_sounds()
-
-# Setup screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Poke Typing")
-
-# Font
-font = pygame.font.Font(resource_path(FONTPATH), 30)
-large_font = pygame.font.Font(resource_path("assets/font/MS PGothic.ttf"), 92)
-mini_font = pygame.font.Font(resource_path("assets/font/pokemon-gen-4-regular.ttf"), 20)
-
-# Clock
-clock = pygame.time.Clock()
-
-# Timer event IDs
-SPAWN_POKEMON_EVENT = pygame.USEREVENT + 1
-MESSAGE_CLEAR_EVENT = pygame.USEREVENT + 2
-WALK_EVENT = pygame.USEREVENT + 3
-JIGGLE_EVENT = pygame.USEREVENT + 4
-SPECIAL_MESSAGE_CLEAR_EVENT = pygame.USEREVENT + 5
-TRANSITION_END_EVENT = pygame.USEREVENT + 6
-
-# Main game loop
-game_session = GameSession(pokemon_data, screen, font)
-
-running = True
-
-pygame.time.set_timer(JIGGLE_EVENT, 110)
-pygame.time.set_timer(WALK_EVENT, 200)
-
-current_time = 0
-
-while running:
-
-    screen.blit(game_session.bg_image, (0, 0))
-    current_time = pygame.time.get_ticks()
-    
-    game_session.update_time(current_time)
-
-    if game_session.current_pokemon and game_session.current_pokemon.legendary and game_session.current_pokemon.get_this_one:
-        game_session.add_special_message("Get this one!")
-        game_session.current_pokemon.get_this_one = False
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-            
-        elif game_session.game_ended:
-            game_session.handle_end_menu_input(event)
-
-        elif game_session.game_paused:
-            game_session.handle_pause_menu_input(event)            
-        
-        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-            if game_session.game_paused:
-                game_session.unpause_game(current_time)
-            elif not game_session.transitioning:
-                game_session.pause_game(current_time)
-
-        elif game_session.current_pokemon and event.type == pygame.KEYDOWN:
-            game_session.typed_name += event.unicode.upper()
-            game_session.animate_last_letter(event.unicode.upper())
-
-            if game_session.current_pokemon.name.startswith(game_session.typed_name):
-                if game_session.typed_name == game_session.current_pokemon.name:
-                    game_session.pokemon_caught(game_session.current_pokemon.elapsed_time)
-            elif not game_session.transitioning:
-                game_session.pokemon_missed(500)
-
-        elif event.type == SPAWN_POKEMON_EVENT:
-            game_session.check_progress()
-        elif event.type == MESSAGE_CLEAR_EVENT:
-            game_session.messages.clear()
-        elif event.type == SPECIAL_MESSAGE_CLEAR_EVENT:
-            game_session.special_message["text"] = ""
-        elif game_session.current_pokemon and event.type == JIGGLE_EVENT:
-            game_session.jiggle_offset = game_session.jiggle()
-        elif game_session.current_pokemon and event.type == WALK_EVENT:
-            game_session.current_pokemon.walk()
-        elif event.type == TRANSITION_END_EVENT:
-            game_session.unpause_game(current_time, False)
-            game_session.spawn_pokemon()
-
-    if game_session.transitioning:
-        game_session.display_region_transition()
-        continue
-
-    if game_session.animation_state != "IDLE":
-        game_session.update_capture_animation(screen)
-
-    # Miss Pokemon due to running out of time
-    if game_session.current_pokemon:
-        if game_session.current_pokemon.elapsed_time > game_session.current_pokemon.time_limit:
-            if not game_session.transitioning:
-                if game_session.animation_state == "IDLE":
-                    game_session.pokemon_missed(10)
-
-    # Display messages
-    if game_session.game_ended:
-        game_session.draw_end_screen(screen, font)
+from frames import FramePacer, FrameClock
+from replay import InputRecorder, InputReplay
+from profiler import FrameProfiler
+from config import SCREEN_HEIGHT, SCREEN_WIDTH, WHITE, BLACK, FONTPATH, TRANSITION_TIME, TARGET_FPS
+from fonts import Fonts
+
+def handle_event(game_session, event, current_time):
+    """
+    Apply one input event to the game. Returns False when the game should quit.
+    """
+    if event.type == pygame.QUIT:
+        return False
+
+    elif game_session.game_ended:
+        game_session.handle_end_menu_input(event)
+
     elif game_session.game_paused:
-        game_session.draw_pause_menu(screen, font)
+        game_session.handle_pause_menu_input(event)
+
+    elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+        if game_session.game_paused:
+            game_session.unpause_game(current_time)
+        elif not game_session.transitioning:
+            game_session.pause_game(current_time)
+
+    elif game_session.current_pokemon and event.type == pygame.KEYDOWN:
+        game_session.typed_name += event.unicode.upper()
+        game_session.animate_last_letter(event.unicode.upper())
+        game_session.check_typed_name()
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Poke Typing")
+    parser.add_argument("--seed", type=int, help="seed for choosing the Pokemon")
+    parser.add_argument("--record", metavar="PATH", help="record the input to a log file")
+    parser.add_argument("--replay", metavar="PATH", help="play back a recorded input log")
+    parser.add_argument("--fast", action="store_true", help="replay as fast as possible instead of in real time")
+    args = parser.parse_args()
+
+    # Initialize Pygame
+    pygame.init()
+
+    # Load the compiled Pokedex, or the JSON data if it is out of date
+    pokemon_data = load_pokedex()
+
+    # Index the name sounds, they are decoded on demand
+    Pokemon.load_name_sounds()
+
+    # Setup screen
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Poke Typing")
+
+    # Font
+    font = Fonts.get(FONTPATH, 30)
+    large_font = Fonts.get("assets/font/MS PGothic.ttf", 92)
+    mini_font = Fonts.get("assets/font/pokemon-gen-4-regular.ttf", 20)
+
+    # Pre-load the sizes used by the region transition (up to 3x) and the typed letter "boom" (up to 1.5x)
+    Fonts.prewarm(FONTPATH, font.get_height(), 3.0)
+    Fonts.prewarm(FONTPATH, large_font.get_height(), 1.5)
+
+    # A replay starts from the recorded seed and clock, a recording remembers them
+    replay = InputReplay(args.replay) if args.replay else None
+    if replay:
+        seed = replay.seed
+        game_clock = FrameClock(replay.start_tick)
+        frames = replay.frames()
     else:
-        if game_session.current_pokemon:
-            game_session.draw_game_elements(screen, large_font, game_session.current_pokemon.elapsed_time, game_session.bg_image)
-        # Draw the caught Pokémon icons
-        game_session.display_messages(screen, font, BLACK, SCREEN_WIDTH)
-        game_session.display_special_message(screen, font, BLACK, SCREEN_WIDTH, SCREEN_HEIGHT)
-    
-    if not game_session.game_ended:
-        game_session.draw_game_scores(screen, font)
-        game_session.draw_caught_pokemon_icons(screen)
-    
-
-    # Draw the copyright line
-    copyright_text = "Copyright 2024 Joseph Bae, made for my children with love"
-    text_surface = mini_font.render(copyright_text, True, WHITE)
-    screen.blit(text_surface, (SCREEN_WIDTH - text_surface.get_width() - 30, SCREEN_HEIGHT - 30))
-    
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
\ No newline at end of file
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        game_clock = FrameClock()
+    random.seed(seed)
+    recorder = InputRecorder(args.record, seed, game_clock.now) if args.record else None
+
+    # Clock
+    pacer = FramePacer(0 if replay and args.fast else TARGET_FPS)
+    replay_start = pygame.time.get_ticks()
+    profiler = FrameProfiler()
+
+    # Main game loop
+    game_session = GameSession(pokemon_data, screen, font, game_clock, random.Random(seed))
+
+    running = True
+
+    try:
+        while running:
+
+            profiler.begin_frame()
+            game_session.dirty.restore(screen, game_session.bg_image)
+            profiler.mark("restore")
+            if replay:
+                frame = next(frames, None)
+                if frame is None:
+                    break
+                current_time, events = frame
+
+                # Only closing the window gets through besides the recorded input
+                events += pygame.event.get(pygame.QUIT)
+                pygame.event.clear()
+                if not args.fast:
+                    pygame.time.wait(current_time - replay.start_tick - (pygame.time.get_ticks() - replay_start))
+            else:
+                current_time = pygame.time.get_ticks()
+                events = pygame.event.get()
+            game_clock.advance(current_time)
+            if recorder:
+                recorder.record(current_time, events)
+            profiler.mark("event_get")
+
+            game_session.update_time(current_time)
+            profiler.mark("update_time")
+
+            if game_session.current_pokemon and game_session.current_pokemon.legendary and game_session.current_pokemon.get_this_one:
+                game_session.add_special_message("Get this one!")
+                game_session.current_pokemon.get_this_one = False
+
+            for event in events:
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    profiler.toggle()
+                    game_session.dirty.invalidate()
+                    continue
+                running = handle_event(game_session, event, current_time) and running
+            profiler.mark("events")
+
+            # Spawns, transitions, message timeouts and idle animations, on the game clock
+            game_session.run_timers(current_time)
+            profiler.mark("timers")
+
+            if game_session.transitioning:
+                game_session.display_region_transition()
+                profiler.mark("transition")
+                profiler.end_frame()
+                pacer.tick()
+                continue
+
+            if game_session.animation_state != "IDLE":
+                game_session.update_capture_animation(screen)
+                profiler.mark("update_capture_animation")
+
+            # Miss Pokemon due to running out of time
+            if game_session.is_timed_out() and game_session.animation_state == "IDLE":
+                game_session.pokemon_missed(10)
+
+            # Display messages
+            if game_session.game_ended:
+                game_session.draw_end_screen(screen, font)
+            elif game_session.game_paused:
+                game_session.draw_pause_menu(screen, font)
+            else:
+                if game_session.current_pokemon:
+                    game_session.draw_game_elements(screen, large_font, game_session.current_pokemon.elapsed_time, game_session.bg_image)
+                    profiler.mark("draw_game_elements")
+                # Draw the caught Pokémon icons
+                game_session.display_messages(screen, font, BLACK, SCREEN_WIDTH)
+                game_session.display_special_message(screen, font, BLACK, SCREEN_WIDTH, SCREEN_HEIGHT)
+                profiler.mark("display_messages")
+
+            if not game_session.game_ended:
+                game_session.draw_game_scores(screen, font)
+                profiler.mark("draw_game_scores")
+                game_session.draw_caught_pokemon_icons(screen)
+                profiler.mark("draw_caught_pokemon_icons")
+
+
+            # Draw the copyright line
+            copyright_text = "Copyright 2024 Joseph Bae, made for my children with love"
+            text_surface = mini_font.render(copyright_text, True, WHITE)
+            game_session.dirty.add(screen.blit(text_surface, (SCREEN_WIDTH - text_surface.get_width() - 30, SCREEN_HEIGHT - 30)))
+
+            # Frame-time graph at the top of the screen
+            game_session.dirty.add(profiler.draw(screen, SCREEN_WIDTH // 2 - profiler.GRAPH_SIZE[0] // 2, 10))
+            profiler.mark("overlay")
+
+            game_session.dirty.flush()
+            profiler.mark("flip")
+            profiler.end_frame()
+            pacer.tick()
+    finally:
+        if recorder:
+            recorder.close()
+        # The frame budget misses end the profiler log, when profiling
+        profiler.close(pacer.stats())
+
+    if replay:
+        print(f"Replay of seed {seed}: score {int(game_session.total_score)}, caught {game_session.caught_pokemon_count}, mistakes {game_session.total_mistake_count}; {pacer.summary()}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
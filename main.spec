@@ -1,11 +1,19 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+sys.path.insert(0, SPECPATH)
+from config import ASSET_PACK_PATH
+from utils import bundled_asset_dirs
+
+# The asset pack replaces the loose asset directories once build_assets.py pack has been run
+asset_dirs = ['data'] if os.path.exists(ASSET_PACK_PATH) else ['data'] + bundled_asset_dirs()
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[(directory, directory) for directory in asset_dirs if os.path.isdir(directory)],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
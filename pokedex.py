@@ -0,0 +1,187 @@
+"""
+Compiled Pokedex: the ids, names and base stats of pokemon_data_updated.json in flat arrays,
+memory-mapped at startup instead of parsing the JSON.
+
+File layout: MAGIC, a little-endian header length, a JSON header describing the arrays and the
+source file they were built from, then the arrays themselves.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import numpy as np
+from collections.abc import Mapping, Sequence
+from config import POKEMON_DATA_PATH, POKEDEX_PATH
+from utils import resource_path
+
+MAGIC = b"PKDX"
+VERSION = 2
+PREAMBLE = struct.Struct("<4sHI")  # Magic, version, header length
+LANGUAGES = ("english", "japanese", "chinese", "french", "korean")
+STATS = ("HP", "Attack", "Defense", "Sp. Attack", "Sp. Defense", "Speed")
+ALIGNMENT = 8
+
+def source_hash(path):
+    with open(path, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+def source_signature(path):
+    stat = os.stat(path)
+    return {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns, "source_sha1": source_hash(path)}
+
+
+class PokedexRecord(Mapping):
+    """
+    Read-only view of one Pokemon, indexed like a record of the JSON data:
+    record["id"], record["name"]["english"], record["base"]["HP"].
+    Fields are decoded from the arrays on first access.
+    """
+    def __init__(self, pokedex, index):
+        self.pokedex = pokedex
+        self.index = index
+        self.fields = {}
+
+    def __getitem__(self, key):
+        if key not in self.fields:
+            self.fields[key] = self.decode(key)
+        return self.fields[key]
+
+    def decode(self, key):
+        if key == "id":
+            return int(self.pokedex.ids[self.index])
+        if key == "name":
+            return {language: self.pokedex.name(self.index, language) for language in LANGUAGES}
+        if key == "base" and self.pokedex.stats[self.index, 0] >= 0:
+            return dict(zip(STATS, self.pokedex.stats[self.index].tolist()))
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield "id"
+        yield "name"
+        if self.pokedex.stats[self.index, 0] >= 0:
+            yield "base"
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class PokedexSlice(Sequence):
+    """
+    A range of the Pokedex, without creating its records until they are read.
+    """
+    def __init__(self, pokedex, indices):
+        self.pokedex = pokedex
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PokedexSlice(self.pokedex, self.indices[index])
+        return self.pokedex[self.indices[index]]
+
+
+class Pokedex(Sequence):
+    """
+    The compiled Pokedex, memory-mapped. Records are created on first access.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_length = PREAMBLE.unpack_from(self.buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Pokedex")
+        self.header = json.loads(self.buffer[PREAMBLE.size:PREAMBLE.size + header_length])
+        for name, spec in self.header["arrays"].items():
+            count = int(np.prod(spec["shape"]))
+            array = np.frombuffer(self.buffer, spec["dtype"], count, spec["offset"]).reshape(spec["shape"])
+            setattr(self, name, array)
+        self.records = [None] * len(self.ids)
+
+    def is_built_from(self, source_path):
+        """
+        Whether the source is unchanged since the build. Only a stat when its size and modification
+        time still match; the source is hashed only when the time changed (e.g. after a checkout).
+        """
+        stat = os.stat(source_path)
+        if stat.st_size != self.header["source_size"]:
+            return False
+        if stat.st_mtime_ns == self.header.get("source_mtime_ns"):
+            return True
+        return source_hash(source_path) == self.header["source_sha1"]
+
+    def name(self, index, language):
+        slot = index * len(LANGUAGES) + LANGUAGES.index(language)
+        start, end = self.name_offsets[slot], self.name_offsets[slot + 1]
+        return self.names[start:end].tobytes().decode("utf-8")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PokedexSlice(self, range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        record = self.records[index]
+        if record is None:
+            record = self.records[index] = PokedexRecord(self, index)
+        return record
+
+
+def build_pokedex(source_path=POKEMON_DATA_PATH, output_path=POKEDEX_PATH):
+    with open(source_path, "r", encoding="utf-8") as file:
+        pokemon_data = json.load(file)
+
+    ids = np.array([data["id"] for data in pokemon_data], np.int16)
+    stats = np.full((len(pokemon_data), len(STATS)), -1, np.int16)
+    for i, data in enumerate(pokemon_data):
+        if "base" in data:
+            stats[i] = [data["base"][stat] for stat in STATS]
+
+    # All names in one UTF-8 blob, found through an offset table
+    encoded = [data["name"].get(language, "").encode("utf-8") for data in pokemon_data for language in LANGUAGES]
+    name_offsets = np.zeros(len(encoded) + 1, np.int32)
+    name_offsets[1:] = np.cumsum([len(name) for name in encoded])
+    names = np.frombuffer(b"".join(encoded), np.uint8)
+
+    arrays = {"ids": ids, "stats": stats, "name_offsets": name_offsets, "names": names}
+    header = dict(source_signature(source_path), arrays={})
+    # Arrays start after the header, so lay them out until the header length stops changing
+    header_bytes = b""
+    while True:
+        offset = PREAMBLE.size + len(header_bytes)
+        for name, array in arrays.items():
+            offset += -offset % ALIGNMENT
+            header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += array.nbytes
+        encoded_header = json.dumps(header).encode("utf-8")
+        settled = len(encoded_header) == len(header_bytes)
+        header_bytes = encoded_header
+        if settled:
+            break
+
+    with open(output_path, "wb") as file:
+        file.write(PREAMBLE.pack(MAGIC, VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for name, array in arrays.items():
+            file.write(b"\0" * (header["arrays"][name]["offset"] - file.tell()))
+            file.write(array.tobytes())
+    return len(pokemon_data)
+
+
+def load_pokedex(source_path=POKEMON_DATA_PATH, compiled_path=POKEDEX_PATH):
+    """
+    Open the compiled Pokedex, or parse the JSON when the compiled file is missing or older than the JSON.
+    """
+    source_path, compiled_path = resource_path(source_path), resource_path(compiled_path)
+    if os.path.exists(compiled_path):
+        pokedex = Pokedex(compiled_path)
+        # A frozen app ships both files together and cannot edit the JSON, so there is nothing to check
+        if getattr(sys, "frozen", False) or not os.path.exists(source_path) or pokedex.is_built_from(source_path):
+            return pokedex
+    with open(source_path, "r", encoding="utf-8") as file:
+        return json.load(file)
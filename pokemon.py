@@ -1,51 +1,80 @@
 import pygame
 import random
 import os
-from utils import resource_path
-from config import LEGENDARY_CUTOFF, NORMAL_POKEMON_CATCH_TIME, LEGENDARY_POKEMON_CATCH_TIME, SCREEN_WIDTH, SCREEN_HEIGHT
+from utils import resource_exists
+from sounds import NameSoundBank
+from fonts import Fonts
+from cache import LRUCache, surface_nbytes
+from audio import audio
+from registry import Assets
+from atlas import Atlas
+from render import ScaleLadder
+from rules import PokemonState
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, SPECIES_ASSET_BUDGET, POKEMON_MAX_SCALE, NAME_CALLS_DIR
 
-class Pokemon:
-    name_sounds = {}
+def species_nbytes(assets):
+    return sum(surface_nbytes(surface) for surface in assets)
+
+class Pokemon(PokemonState):
+    name_sounds = NameSoundBank()
+    # Prepared (sprite, icon, bg) per species, shared by every instance and kept across games
+    species_assets = LRUCache(SPECIES_ASSET_BUDGET, species_nbytes)
+    # Sheets packed by build_assets.py; loose files are used for ids they do not have
+    sprite_atlas = Atlas("sprites")
+    icon_atlas = Atlas("icons")
 
     @classmethod
-    def load_name_sounds(cls, sounds_folder=resource_path("assets/names")):
-        for filename in os.listdir(sounds_folder):
-            if filename.endswith(".wav"):
-                id = int(filename.split('-')[0])
-                cls.name_sounds[id] = pygame.mixer.Sound(os.path.join(sounds_folder, filename))
+    def load_name_sounds(cls, sounds_folder="assets/names"):
+        # Only index the clips here, each sound is decoded when its Pokemon is created
+        manifest_path = os.path.join(NAME_CALLS_DIR, "manifest.json")
+        if resource_exists(manifest_path):
+            cls.name_sounds.load_manifest(manifest_path)
+        else:
+            cls.name_sounds.index(sounds_folder)
 
-    def __init__(self, data):
-        self.id = data["id"]
-        self.name = data["name"]["english"].upper()
+    def __init__(self, data, legendary=None, time_limit=None, index=None):
+        super().__init__(data, legendary, time_limit, index)
         self.japanese_name = data["name"]["japanese"]
         self.korean_name = data["name"]["korean"]
-        self.sprite = self.load_image()
-        self.icon = self.load_icon()
-        self.bg = self.load_bg_image()
-        self.cry = self.load_sound()
-        self.name_sound = Pokemon.name_sounds.get(self.id, None)
-        self.is_caught = False
-        self.caught_time = None
-        self.ball_hit = False
-        self.legendary = self.is_legendary(data["base"])
-        self.is_fast = False
-        self.is_super_fast = False
-        self.time_limit = self.get_time_limit(data["base"])
-        self.start_time = pygame.time.get_ticks()
+        self.sprite, self.icon, self.bg = self.load_assets()
+        self.cry = audio.cry(self.id)
+        self.sprite_ladder = ScaleLadder(self.sprite, 1.0, POKEMON_MAX_SCALE)
+        Pokemon.name_sounds.request(self.id)
         self.get_this_one = True
         self.walk_offset = [0,0]
         self.current_position = [0,0]
-        self.elapsed_time = 0
-        self.total_paused_time = 0
+
+    @property
+    def name_sound(self):
+        return Pokemon.name_sounds.get(self.id)
+
+    def load_assets(self):
+        assets = Pokemon.species_assets.get(self.id)
+        if assets is None:
+            assets = Pokemon.species_assets.put(self.id, (self.load_image(), self.load_icon(), self.load_bg_image()))
+        return assets
 
     def load_image(self):
-        return pygame.image.load(resource_path(os.path.join('assets/sprites', f"{self.id}.png")))
+        sprite = Pokemon.sprite_atlas.get(self.id)
+        if sprite is None:
+            sprite = Assets.load(os.path.join('assets/sprites', f"{self.id}.png"))
+        return sprite
 
     def load_icon(self):
-        return pygame.image.load(resource_path(os.path.join('assets/icons', f"{self.id}.png")))
+        icon = Pokemon.icon_atlas.get(self.id)
+        if icon is None:
+            icon = Assets.load(os.path.join('assets/icons', f"{self.id}.png"))
+        return icon
 
     def load_bg_image(self, target_size=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2), gray_alpha=0.9):
-        original_image = pygame.image.load(resource_path(os.path.join('assets/sugimori_mini', f"{self.id}.png"))).convert_alpha()
+        # Use the card pre-rendered by build_assets.py when it has been built
+        if resource_exists(os.path.join('assets/cards', f"{self.id}.png")):
+            return Assets.load(os.path.join('assets/cards', f"{self.id}.png"))
+        return Pokemon.render_bg_image(self.id, self.japanese_name, self.korean_name, target_size, gray_alpha)
+
+    @staticmethod
+    def render_bg_image(id, japanese_name, korean_name, target_size=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2), gray_alpha=0.9):
+        original_image = Assets.load(os.path.join('assets/sugimori_mini', f"{id}.png"))
         orig_width, orig_height = original_image.get_size()
         aspect_ratio = orig_width / orig_height
         if aspect_ratio > (target_size[0] / target_size[1]):
@@ -61,13 +90,13 @@ class Pokemon:
         final_image.blit(gray_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
         
         # Render the Korean and Japanese name
-        japanese_font = pygame.font.Font(resource_path("assets/font/MS PGothic.ttf"), 72)  # Adjust the font size as needed
-        korean_font = pygame.font.Font(resource_path("assets/font/UnGungseo.ttf"), 72)  # Adjust the font size as needed
-        id_font = pygame.font.Font(resource_path("assets/font/Courier New.ttf"), 62)
+        japanese_font = Fonts.get("assets/font/MS PGothic.ttf", 72)  # Adjust the font size as needed
+        korean_font = Fonts.get("assets/font/UnGungseo.ttf", 72)  # Adjust the font size as needed
+        id_font = Fonts.get("assets/font/Courier New.ttf", 62)
         
-        japanese_surface = japanese_font.render(self.japanese_name, True, (244, 244, 244))  # Stylize the text as needed (e.g., color)
-        korean_surface = korean_font.render(self.korean_name, True, (244, 244, 244))  # Stylize the text as needed (e.g., color)
-        id_surface = id_font.render(f"#{self.id:04d}", True, (244,244,244))
+        japanese_surface = japanese_font.render(japanese_name, True, (244, 244, 244))  # Stylize the text as needed (e.g., color)
+        korean_surface = korean_font.render(korean_name, True, (244, 244, 244))  # Stylize the text as needed (e.g., color)
+        id_surface = id_font.render(f"#{id:04d}", True, (244,244,244))
         
         # Position the text at the bottom-right corner, justified to the right edge
         japanese_rect = japanese_surface.get_rect(bottomright=(new_width - 10, new_height - 10))  # 10-pixel padding from edges
@@ -79,26 +108,6 @@ class Pokemon:
         
         return final_image
 
-    def load_sound(self):
-        return pygame.mixer.Sound(resource_path(os.path.join('assets/cries', f"{self.id}.ogg")))
-
-    def is_legendary(self, base_stats):
-        BST = base_stats["HP"] + base_stats["Attack"] + base_stats["Sp. Attack"]
-        BST += base_stats["Defense"] + base_stats["Speed"] + base_stats["Sp. Defense"]
-        return BST >= LEGENDARY_CUTOFF
-
-    def get_time_limit(self, base_stats):
-        return LEGENDARY_POKEMON_CATCH_TIME if self.is_legendary(base_stats) else NORMAL_POKEMON_CATCH_TIME
-
     def walk(self):
         self.walk_offset[0] += random.randint(-5, 5)
-        self.walk_offset[1] += random.randint(-5, 10)
-        
-    def copy(self):
-        # Create a new Pokemon instance without initializing it
-        new_copy = Pokemon.__new__(Pokemon)
-
-        # Copy the attributes from the current instance to the new one
-        new_copy.__dict__ = self.__dict__.copy()
-
-        return new_copy
\ No newline at end of file
+        self.walk_offset[1] += random.randint(-5, 10)
\ No newline at end of file
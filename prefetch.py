@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+
+class PokemonPrefetcher:
+    """
+    Build the next Pokemon on a worker thread while the current one is on screen,
+    so that spawning only has to swap in an already loaded object.
+    """
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self.pending = None  # (generation, future)
+
+    def prefetch(self, generation, create, *args):
+        """Build create(*args) in the background, for a spawn in this generation."""
+        self.cancel()
+        self.pending = (generation, self.executor.submit(create, *args))
+
+    def take(self, generation):
+        """
+        Return the prefetched Pokemon, or None if nothing was prefetched for this generation.
+        Waits for the worker if it is still loading.
+        """
+        if self.pending is None:
+            return None
+        pending_generation, future = self.pending
+        self.pending = None
+        if pending_generation != generation:
+            future.cancel()
+            return None
+        return future.result()
+
+    def cancel(self):
+        if self.pending is not None:
+            self.pending[1].cancel()
+            self.pending = None
@@ -0,0 +1,91 @@
+import pygame
+import json
+import os
+import time
+import numpy as np
+from collections import deque
+from config import FRAME_BUDGET_MS, FRAME_STATS_WINDOW, PROFILE_LOG, WHITE, RED, GREEN
+
+class FrameProfiler:
+    """
+    Time each stage of the main loop while enabled, show a rolling frame-time graph and
+    write one JSON line of stage timings per frame.
+    Stages are laps: mark(name) charges the time since the previous mark to name.
+    - log_path: JSON lines file the timings are appended to.
+    """
+    GRAPH_SIZE = (300, 90)
+    GRAPH_MAX_MS = FRAME_BUDGET_MS * 3  # Top of the graph
+
+    def __init__(self, enabled=None, log_path=PROFILE_LOG, window=FRAME_STATS_WINDOW):
+        self.log_path = log_path
+        self.log = None
+        self.frame_times = deque(maxlen=window)
+        self.frame_count = 0
+        self.stages = {}
+        self.frame_start = self.lap_start = 0
+        self.font = pygame.font.Font(None, 22)
+        self.enabled = False
+        if enabled is None:
+            enabled = os.environ.get("POKE_PROFILE", "") not in ("", "0")
+        if enabled:
+            self.toggle()
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if self.enabled and self.log is None:
+            self.log = open(self.log_path, "a")
+        self.frame_times.clear()
+
+    def begin_frame(self):
+        if self.enabled:
+            self.stages = {}
+            self.frame_start = self.lap_start = time.perf_counter()
+
+    def mark(self, stage):
+        if self.enabled:
+            now = time.perf_counter()
+            self.stages[stage] = self.stages.get(stage, 0) + (now - self.lap_start) * 1000
+            self.lap_start = now
+
+    def end_frame(self):
+        if self.enabled:
+            total = (time.perf_counter() - self.frame_start) * 1000
+            self.frame_times.append(total)
+            self.frame_count += 1
+            record = {"frame": self.frame_count, "total": round(total, 3)}
+            record.update((stage, round(ms, 3)) for stage, ms in self.stages.items())
+            self.log.write(json.dumps(record) + "\n")
+
+    def draw(self, screen, x=10, y=10):
+        """
+        Draw the frame-time graph with its p50 and p99. Returns the area drawn.
+        """
+        if not self.enabled or not self.frame_times:
+            return None
+        width, height = self.GRAPH_SIZE
+        graph = pygame.Surface((width, height), pygame.SRCALPHA)
+        graph.fill((0, 0, 0, 160))
+
+        # One bar per frame, newest on the right
+        scale = height / self.GRAPH_MAX_MS
+        bar_x = width - len(self.frame_times)
+        for frame_time in self.frame_times:
+            color = RED if frame_time > FRAME_BUDGET_MS else GREEN
+            bar_height = min(height, int(frame_time * scale))
+            graph.fill(color, (bar_x, height - bar_height, 1, bar_height))
+            bar_x += 1
+        budget_y = height - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(graph, WHITE, (0, budget_y), (width, budget_y))
+
+        p50, p99 = np.percentile(self.frame_times, (50, 99))
+        label = self.font.render(f"p50 {p50:.1f} ms  p99 {p99:.1f} ms  max {max(self.frame_times):.1f} ms", True, WHITE)
+        graph.blit(label, (5, 5))
+        return screen.blit(graph, (x, y))
+
+    def close(self, summary=None):
+        """Close the log, ending it with a summary record if given."""
+        if self.log:
+            if summary is not None:
+                self.log.write(json.dumps({"summary": summary}) + "\n")
+            self.log.close()
+            self.log = None
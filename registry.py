@@ -0,0 +1,64 @@
+import pygame
+import threading
+from utils import open_resource
+
+class Assets:
+    """
+    Process-wide registry of images, each loaded from disk once and converted to the display
+    format for fast blits. Shared by Sprites, GameSession and Pokemon, and safe to use from the
+    prefetch thread.
+    """
+    images = {}
+    lock = threading.Lock()
+
+    @classmethod
+    def image(cls, path, size=None, alpha=None):
+        """
+        Registered image, scaled to size if given.
+        - alpha: Convert with per-pixel alpha (convert_alpha) or without (convert, which keeps a colorkey).
+          By default the image keeps the kind of transparency its file has.
+        """
+        key = (path, size, alpha)
+        with cls.lock:
+            image = cls.images.get(key)
+        if image is None:
+            image = cls.load(path, alpha)
+            if size:
+                image = pygame.transform.scale(image, size)
+            with cls.lock:
+                image = cls.images.setdefault(key, image)
+        return image
+
+    @staticmethod
+    def load(path, alpha=None):
+        """Load and convert an image without registering it, for images cached elsewhere."""
+        with open_resource(path) as file:
+            image = pygame.image.load(file, path)
+        # Converting needs a display mode; before that the image is kept in its file format
+        if pygame.display.get_surface() is not None:
+            if alpha is None:
+                alpha = bool(image.get_flags() & pygame.SRCALPHA)
+            if alpha:
+                image = image.convert_alpha()
+            else:
+                Assets.separate_colorkey(image)
+                image = image.convert()
+        return image
+
+    @staticmethod
+    def separate_colorkey(image):
+        """
+        A paletted image is keyed by palette index but a converted one by color, so palette entries
+        sharing the key's color would turn transparent. Give the key entry a color of its own.
+        """
+        key = image.get_colorkey()
+        if image.get_bitsize() != 8 or key is None:
+            return
+        palette = [tuple(color)[:3] for color in image.get_palette()]
+        if palette.count(key[:3]) < 2:
+            return
+        keyed = pygame.surfarray.array2d(image)[pygame.surfarray.array_alpha(image.convert_alpha()) == 0]
+        if keyed.size:
+            color = next((red, 0, 255) for red in range(256) if (red, 0, 255) not in palette)
+            image.set_palette_at(int(keyed[0]), color)
+            image.set_colorkey(color)
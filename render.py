@@ -0,0 +1,157 @@
+import numpy as np
+import pygame
+from cache import LRUCache, surface_nbytes
+from config import TEXT_CACHE_SIZE, GRADIENT_CACHE_BUDGET, ROUNDED_RECT_CACHE_BUDGET, SCALE_LADDER_STEPS
+
+# Outlined text surfaces keyed by (font, text, color, outline color, thickness)
+text_cache = LRUCache(TEXT_CACHE_SIZE)
+
+# Gradient rounded rectangles keyed by (size, color1, color2, radius)
+gradient_cache = LRUCache(GRADIENT_CACHE_BUDGET, surface_nbytes)
+
+# Rounded rectangles keyed by (size, color, radius, outline color, outline width)
+rounded_rect_cache = LRUCache(ROUNDED_RECT_CACHE_BUDGET, surface_nbytes)
+
+def render_outlined_text(text, font, color, outline_color, outline_thickness):
+    """
+    Render text with an outline into a single surface, reusing it while it stays in the cache.
+    The text itself starts at (outline_thickness, outline_thickness) in the returned surface.
+    """
+    key = (font, text, color, outline_color, outline_thickness)
+    surface = text_cache.get(key)
+    if surface is None:
+        text_obj = font.render(text, True, color)
+        outline_surface = font.render(text, True, outline_color)
+        surface = pygame.Surface((text_obj.get_width() + 2 * outline_thickness, text_obj.get_height() + 2 * outline_thickness), pygame.SRCALPHA)
+
+        # Draw outline
+        for dx in range(-outline_thickness, outline_thickness + 1):
+            for dy in range(-outline_thickness, outline_thickness + 1):
+                if dx != 0 or dy != 0:
+                    surface.blit(outline_surface, (outline_thickness + dx, outline_thickness + dy))
+
+        surface.blit(text_obj, (outline_thickness, outline_thickness))
+        text_cache.put(key, surface)
+    return surface
+
+def render_gradient_rect(size, color1, color2, radius):
+    """
+    Render a vertical gradient rounded rectangle, reusing it while it stays in the cache.
+    """
+    key = (size, color1, color2, radius)
+    surface = gradient_cache.get(key)
+    if surface is None:
+        width, height = size
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+
+        # One color per row, blended from color1 at the top to color2 at the bottom
+        ratio = np.arange(height)[:, None] / height
+        colors = (np.array(color1) * (1 - ratio) + np.array(color2) * ratio).astype(np.uint8)
+
+        # Rounded mask, same threshold as pygame.mask.from_surface
+        mask_surface = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(mask_surface, (255, 255, 255), mask_surface.get_rect(), border_radius=radius)
+        inside = pygame.surfarray.array_alpha(mask_surface) > 127
+
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels[:] = colors[None, :, :]
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        alpha[:] = np.where(inside, 255, 0)
+        del alpha
+        gradient_cache.put(key, surface)
+    return surface
+
+def render_rounded_rect(size, color, radius, outline_color, outline_width):
+    """
+    Render a 50% transparent rounded rectangle with optional outline, reusing it while it stays in the cache.
+    """
+    key = (size, color, radius, outline_color, outline_width)
+    surface = rounded_rect_cache.get(key)
+    if surface is None:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        
+        # Adjust the color to include 50% transparency
+        color_with_alpha = (*color, 128)  # Assuming color is (R, G, B)
+        
+        pygame.draw.rect(surface, color_with_alpha, surface.get_rect(), border_radius=radius)
+        if outline_color:
+            pygame.draw.rect(surface, outline_color, surface.get_rect(), outline_width, border_radius=radius)
+        rounded_rect_cache.put(key, surface)
+    return surface
+
+
+class ScaleLadder:
+    """
+    Copies of a sprite pre-scaled at evenly spaced steps from min_scale to max_scale,
+    so animations look up the nearest step instead of scaling every frame.
+    """
+    def __init__(self, surface, min_scale, max_scale, steps=SCALE_LADDER_STEPS):
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        width, height = surface.get_size()
+        self.frames = [pygame.transform.scale(surface, (int(width * scale), int(height * scale))) for scale in np.linspace(min_scale, max_scale, steps)]
+
+    def at(self, scale):
+        index = round((scale - self.min_scale) / (self.max_scale - self.min_scale) * (len(self.frames) - 1))
+        return self.frames[min(max(index, 0), len(self.frames) - 1)]
+
+
+class CachedLayer:
+    """
+    Offscreen surface that is only rebuilt when it is invalidated or its key changes.
+    - build: Function creating the surface, called with the arguments given to get.
+    """
+    def __init__(self, build):
+        self.build = build
+        self.key = None
+        self.surface = None
+
+    def get(self, key=None, *args):
+        if self.surface is None or key != self.key:
+            self.surface = self.build(*args)
+            self.key = key
+        return self.surface
+
+    def invalidate(self):
+        self.surface = None
+
+
+class DirtyRects:
+    """
+    Track the screen areas drawn during a frame, so the next frame only has to restore the
+    background and update the display where something was drawn.
+    When disabled, every frame repaints the full background and flips the whole display.
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.rects = []
+        self.previous_rects = []
+        self.full_redraw = True
+
+    def add(self, rect):
+        if rect:
+            self.rects.append(rect)
+        return rect
+
+    def invalidate(self):
+        """Repaint the whole screen on the next frame, e.g. after the background changed."""
+        self.full_redraw = True
+
+    def restore(self, screen, bg_image):
+        """Clear what was drawn during the previous frame."""
+        if self.full_redraw or not self.enabled:
+            screen.blit(bg_image, (0, 0))
+        else:
+            for rect in self.previous_rects:
+                screen.blit(bg_image, rect, rect)
+
+    def flush(self):
+        """Push this frame to the display."""
+        if self.full_redraw or not self.enabled:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous_rects + self.rects)
+        self.previous_rects = self.rects
+        self.rects = []
+        self.full_redraw = False
@@ -0,0 +1,64 @@
+import pygame
+import struct
+
+# File layout: a header, then for every frame its tick and event count followed by the events
+HEADER = struct.Struct("<4sHqI")  # Magic, version, RNG seed, clock at session start
+FRAME = struct.Struct("<IH")  # Tick, number of events
+EVENT = struct.Struct("<HII")  # Event type, key (pygame 2 key codes need 32 bits), unicode code point (0 for none)
+MAGIC = b"PKRP"
+VERSION = 3
+
+# Events that change the game; everything else is left out of the log. Timers run on the
+# recorded clock, so they replay without being logged.
+RECORDED_EVENTS = {pygame.QUIT, pygame.KEYDOWN}
+
+class InputRecorder:
+    """
+    Write every frame's tick and its game events to a binary log for InputReplay.
+    - path: Log file to write.
+    - seed: RNG seed the session was started with.
+    - start_tick: Clock time when the session was created.
+    """
+    def __init__(self, path, seed, start_tick):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, start_tick))
+
+    def record(self, tick, events):
+        events = [event for event in events if event.type in RECORDED_EVENTS]
+        self.file.write(FRAME.pack(tick, len(events)))
+        for event in events:
+            unicode = getattr(event, "unicode", "")
+            self.file.write(EVENT.pack(event.type, getattr(event, "key", 0), ord(unicode) if len(unicode) == 1 else 0))
+
+    def close(self):
+        self.file.close()
+
+
+class InputReplay:
+    """
+    Read a log written by InputRecorder.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.data = file.read()
+        magic, version, self.seed, self.start_tick = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} input log")
+
+    def frames(self):
+        """
+        Yield the tick and the list of pygame events of each recorded frame.
+        """
+        offset = HEADER.size
+        while offset < len(self.data):
+            tick, count = FRAME.unpack_from(self.data, offset)
+            offset += FRAME.size
+            events = []
+            for _ in range(count):
+                type, key, codepoint = EVENT.unpack_from(self.data, offset)
+                offset += EVENT.size
+                if type == pygame.KEYDOWN:
+                    events.append(pygame.event.Event(type, key=key, unicode=chr(codepoint) if codepoint else ""))
+                else:
+                    events.append(pygame.event.Event(type))
+            yield tick, events
@@ -0,0 +1,274 @@
+import random
+from collections import deque
+from spawn import SpawnTable
+from scheduler import Scheduler
+from config import GENS, PASS_MARK, MAX_MISTAKE, REWARD_MAP, LEGENDARY_CUTOFF, NORMAL_POKEMON_CATCH_TIME, LEGENDARY_POKEMON_CATCH_TIME, TRANSITION_TIME, LEGENDARY_SPAWN_WEIGHT, AVOID_RECENT_SPAWNS
+
+class PokemonState:
+    """
+    A spawned Pokemon as seen by the game rules: its name, rarity, time limit and timing.
+    Pokemon adds the sprites and sounds on top of it.
+    """
+    icon = None
+
+    # Rarity and time limit knobs, overridable in a subclass for tuning
+    legendary_cutoff = LEGENDARY_CUTOFF
+    normal_catch_time = NORMAL_POKEMON_CATCH_TIME
+    legendary_catch_time = LEGENDARY_POKEMON_CATCH_TIME
+
+    def __init__(self, data, legendary=None, time_limit=None, index=None):
+        """
+        - legendary, time_limit: From the spawn table; computed from the base stats when not given.
+        - index: Position of data in the Pokemon data, for the recent spawns.
+        """
+        self.id = data["id"]
+        self.index = index
+        self.name = data["name"]["english"].upper()
+        self.is_caught = False
+        self.caught_time = None
+        self.ball_hit = False
+        self.legendary = self.is_legendary(data["base"]) if legendary is None else legendary
+        self.is_fast = False
+        self.is_super_fast = False
+        if time_limit is None:
+            time_limit = self.legendary_catch_time if self.legendary else self.normal_catch_time
+        self.time_limit = time_limit
+        self.start_time = 0
+        self.elapsed_time = 0
+        self.total_paused_time = 0
+
+    def is_legendary(self, base_stats):
+        BST = base_stats["HP"] + base_stats["Attack"] + base_stats["Sp. Attack"]
+        BST += base_stats["Defense"] + base_stats["Speed"] + base_stats["Sp. Defense"]
+        return BST >= self.legendary_cutoff
+
+    def copy(self):
+        # Create a new instance without initializing it
+        new_copy = type(self).__new__(type(self))
+
+        # Copy the attributes from the current instance to the new one
+        new_copy.__dict__ = self.__dict__.copy()
+
+        return new_copy
+
+
+class GameRules:
+    """
+    The game rules without display, audio or assets: spawning, catching, missing, scoring and
+    moving between regions. GameSession draws and plays sounds on top of it.
+    - clock: Function returning the current time in milliseconds.
+    - rng: random.Random used to pick the Pokemon.
+    """
+    # Balance knobs, overridable per instance for tuning
+    pass_mark = PASS_MARK
+    max_mistake = MAX_MISTAKE
+    reward_map = REWARD_MAP
+    legendary_weight = LEGENDARY_SPAWN_WEIGHT
+    avoid_recent = AVOID_RECENT_SPAWNS
+    pokemon_class = PokemonState
+
+    def __init__(self, pokemon_data, clock, rng=None):
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.scheduler = Scheduler(self.get_ticks)
+        self.reset_game(pokemon_data)
+
+    def get_ticks(self):
+        return self.clock()
+
+    def reset_game(self, pokemon_data):
+        self.elapsed_time = 0
+        self.game_paused = False
+        self.transitioning = False
+        self.game_ended = False
+        self.paused_time_start = 0
+        self.total_paused_time = 0
+        self.pokemon_data = pokemon_data
+        self.spawn_table = SpawnTable.get(pokemon_data, self.pokemon_class.legendary_cutoff, self.pokemon_class.normal_catch_time,
+                                          self.pokemon_class.legendary_catch_time, self.legendary_weight)
+        self.recent_spawns = deque(maxlen=self.avoid_recent)
+        self.caught_pokemon_count = 0
+        self.combo_count = 0
+        self.mistake_count = 0
+        self.total_mistake_count = 0
+        self.total_score = 0
+        self.current_pokemon = None
+        self.caught_pokemon = None
+        self.typed_name = ""
+        self.start_time = self.get_ticks()
+        self.scheduler.clear()
+        self.caught_pokemons = []
+        self.combo_indices = []
+        self.current_generation = 0
+        self.generations = []
+        self.current_level = 1
+        self.max_region_reached = GENS[self.current_generation]['name']
+        self.start_transition()
+
+    def set_timer(self, name, delay):
+        """
+        Fire handle_timer(name) once after delay milliseconds, replacing any pending timer with the same name.
+        """
+        self.scheduler.schedule(delay, self.handle_timer, name, key=name)
+
+    def next_timer_time(self):
+        return self.scheduler.next_time()
+
+    def run_timers(self, current_time):
+        self.scheduler.run(current_time)
+
+    def handle_timer(self, name):
+        if name == "spawn":
+            # A miss can end the game before its spawn timer fires
+            if not self.game_ended:
+                self.check_progress()
+        elif name == "transition_end":
+            self.unpause_game(self.get_ticks(), False)
+            self.spawn_pokemon()
+
+    def change_generation(self, new_generation):
+        if new_generation > self.current_generation:
+            self.max_region_reached = GENS[new_generation]['name']
+        self.current_generation = new_generation
+        self.start_transition()
+
+    def start_transition(self):
+        if self.current_level > len(self.generations):
+            self.generations.append(self.current_generation)
+        self.pause_game(self.get_ticks(), False)
+        self.transition_start_time = self.get_ticks()
+        self.set_timer("transition_end", TRANSITION_TIME)
+
+    def update_time(self, time):
+        if not self.game_paused:
+            self.elapsed_time = time - self.start_time - self.total_paused_time
+            if self.current_pokemon:
+                self.current_pokemon.elapsed_time = time - self.current_pokemon.start_time - self.current_pokemon.total_paused_time
+
+    def get_combo_reward(self, combo_count):
+        return self.reward_map.get(combo_count, 500*(combo_count-14))
+
+    def get_speed_multiplier(self, elapsed_time, time_limit):
+        percentage = elapsed_time / time_limit
+        if percentage <= 0.35:
+            return 1.5
+        elif percentage <= 0.55:
+            return 1.2
+        else:
+            return 1.0
+
+    def check_progress(self):
+        if self.caught_pokemon_count >=50:
+                self.end_game()
+        elif not self.current_level * 10 > self.caught_pokemon_count:
+            if self.caught_pokemon_count and self.caught_pokemon_count % 10 == 0:
+                legend_or_fast = sum(x[1] or x[3] for x in self.caught_pokemons[-10:])
+                legend_or_fast += sum(x[2] for x in self.caught_pokemons[-10:]) / 2
+                self.current_level += 1
+                if (legend_or_fast >= self.pass_mark) and (self.mistake_count <= self.max_mistake):
+                    self.change_generation(self.current_generation + 1)
+                if (legend_or_fast < self.pass_mark/2) or (self.mistake_count > 2* self.max_mistake):
+                    self.change_generation(max(0, self.current_generation - 1))
+                else:
+                    self.change_generation(self.current_generation)
+                self.mistake_count = 0
+        else:
+            self.spawn_pokemon()
+
+    def choose_pokemon_index(self):
+        return self.spawn_table.draw(self.current_generation, self.rng, self.recent_spawns)
+
+    def create_pokemon(self, index):
+        """The Pokemon at index in the data, with its rarity and time limit from the spawn table."""
+        return self.pokemon_class(self.pokemon_data[index], bool(self.spawn_table.legendary[index]),
+                                  int(self.spawn_table.time_limits[index]), index)
+
+    def next_pokemon(self):
+        return self.create_pokemon(self.choose_pokemon_index())
+
+    def spawn_pokemon(self):
+        self.current_pokemon = self.next_pokemon()
+        # Only Pokemon that actually appear count as recent, not prefetched ones thrown away
+        self.recent_spawns.append(self.current_pokemon.index)
+        self.current_pokemon.start_time = self.get_ticks()
+        self.caught_pokemon = None
+        self.typed_name = ""
+
+    def check_typed_name(self):
+        """
+        Catch the current Pokemon once its full name is typed, or count a miss on a wrong letter.
+        """
+        if self.current_pokemon.name.startswith(self.typed_name):
+            if self.typed_name == self.current_pokemon.name:
+                self.pokemon_caught(self.current_pokemon.elapsed_time)
+        elif not self.transitioning:
+            self.pokemon_missed(500)
+
+    def is_timed_out(self):
+        return (self.current_pokemon is not None and not self.transitioning
+                and self.current_pokemon.elapsed_time > self.current_pokemon.time_limit)
+
+    def pokemon_caught(self, elapsed_time):
+        """
+        Score the current Pokemon. Returns the base score and the speed multiplier.
+        """
+        self.current_pokemon.is_caught = True
+        self.current_pokemon.caught_time = elapsed_time
+        self.caught_pokemon_count += 1
+        self.combo_count += 1
+
+        # Calculate score
+        base_score = self.get_combo_reward(self.combo_count)
+        if self.current_pokemon.legendary:
+            base_score = 10000
+        speed_multiplier = self.get_speed_multiplier(elapsed_time, self.current_pokemon.time_limit)
+        score = base_score * speed_multiplier
+        self.total_score += score
+        self.current_pokemon.is_fast = speed_multiplier == 1.2
+        self.current_pokemon.is_super_fast = speed_multiplier == 1.5
+
+        self.caught_pokemon = self.current_pokemon.copy()
+
+        # Add to caught Pokémon list
+        self.caught_pokemons.append((self.caught_pokemon.icon,
+                                            self.caught_pokemon.legendary,
+                                            self.caught_pokemon.is_fast,
+                                            self.caught_pokemon.is_super_fast))
+
+        self.set_timer("spawn", 1000)
+        return base_score, speed_multiplier
+
+    def pokemon_missed(self, wait_time_ms):
+        if self.combo_count >= 3:
+            self.combo_indices.append((len(self.caught_pokemons) - self.combo_count, len(self.caught_pokemons)))
+        self.combo_count = 0
+        self.mistake_count += 1
+        self.total_mistake_count += 1
+        self.current_pokemon = None
+        if self.mistake_count > self.max_mistake:
+            self.end_game()
+        self.set_timer("spawn", wait_time_ms)
+
+    def pause_game(self, current_time, pause_music = True):
+        self.paused_time_start = current_time
+        if pause_music == True:
+            self.game_paused = True
+            self.scheduler.pause(current_time)
+        else:
+            self.transitioning = True
+
+    def unpause_game(self, current_time, pause_music = True):
+        if pause_music == True:
+            self.total_paused_time += current_time - self.paused_time_start
+            if self.current_pokemon:
+                self.current_pokemon.total_paused_time += current_time - self.paused_time_start
+            self.game_paused = False
+            self.scheduler.resume(current_time)
+        else:
+            self.transitioning = False
+
+    def end_game(self):
+        if self.combo_count >= 3:
+            self.combo_indices.append((len(self.caught_pokemons) - self.combo_count, len(self.caught_pokemons)))
+        self.current_pokemon = None
+        self.game_ended = True
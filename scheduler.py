@@ -0,0 +1,103 @@
+import heapq
+import itertools
+
+class Timer:
+    """
+    A callback waiting in a Scheduler. Cancelled timers stay in the heap and are skipped when reached.
+    """
+    def __init__(self, due_time, callback, args, interval=None, key=None):
+        self.due_time = due_time
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.key = key
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    Timers on the game clock, kept in a min-heap and run once per frame with run().
+    Timers count game time only: while paused they stand still, and they resume where they were.
+    Works without pygame, so the game rules can run headless.
+    - clock: Function returning the current game time in milliseconds.
+    """
+    def __init__(self, clock):
+        self.clock = clock
+        self.sequence = itertools.count()
+        self.clear()
+
+    def game_time(self, now):
+        """Clock time without the time spent paused."""
+        return (self.paused_at if self.paused_at is not None else now) - self.total_paused_time
+
+    def schedule(self, delay, callback, *args, repeat=False, key=None):
+        """
+        Call callback(*args) after delay milliseconds of game time, and then every delay
+        milliseconds if repeat. A timer with a key replaces the pending timer with the same key.
+        """
+        if key is not None and key in self.keys:
+            self.keys[key].cancel()
+        timer = Timer(self.game_time(self.clock()) + delay, callback, args, delay if repeat else None, key)
+        if key is not None:
+            self.keys[key] = timer
+        heapq.heappush(self.heap, (timer.due_time, next(self.sequence), timer))
+        return timer
+
+    def cancel(self, key):
+        timer = self.keys.pop(key, None)
+        if timer:
+            timer.cancel()
+
+    def clear(self):
+        """Drop every timer and start over unpaused."""
+        self.heap = []
+        self.keys = {}
+        self.paused_at = None
+        self.total_paused_time = 0
+
+    def pause(self, now):
+        if self.paused_at is None:
+            self.paused_at = now
+
+    def resume(self, now):
+        if self.paused_at is not None:
+            self.total_paused_time += now - self.paused_at
+            self.paused_at = None
+
+    def pending(self):
+        """Timers still to run, soonest first."""
+        return [timer for _, _, timer in sorted(self.heap) if not timer.cancelled]
+
+    def next_time(self):
+        """Clock time when the next timer is due, or None when there is none or the scheduler is paused."""
+        self.drop_cancelled()
+        if not self.heap or self.paused_at is not None:
+            return None
+        return self.heap[0][0] + self.total_paused_time
+
+    def drop_cancelled(self):
+        while self.heap and self.heap[0][2].cancelled:
+            heapq.heappop(self.heap)
+
+    def run(self, now):
+        """
+        Run every timer due by now, in order. Timers scheduled by the callbacks run in the same
+        pass if they are already due.
+        """
+        current_time = self.game_time(now)
+        while self.heap and self.heap[0][0] <= current_time:
+            _, _, timer = heapq.heappop(self.heap)
+            if timer.cancelled:
+                continue
+            if timer.interval is not None:
+                # Repeat from the due time, but do not catch up on intervals missed by a long frame
+                timer.due_time += timer.interval
+                if timer.due_time <= current_time:
+                    timer.due_time = current_time + timer.interval
+                heapq.heappush(self.heap, (timer.due_time, next(self.sequence), timer))
+            elif timer.key is not None:
+                del self.keys[timer.key]
+            timer.callback(*timer.args)
@@ -1,104 +1,102 @@
-import numpy as np
 import pygame
 import random
 from pokemon import Pokemon
+from rules import GameRules
 from sprites import Sprites
-from config import SCREEN_WIDTH, SCREEN_HEIGHT, NOT_SHOW_NAME_TIME, REWARD_MAP, WHITE, BLACK, GREEN, AMBER, RED, GRAY, LIGHT_GRAY, COMBOCOLOR1, COMBOCOLOR2, GENS, PASS_MARK, MAX_MISTAKE, FONTPATH, TRANSITION_TIME, ARROW_TRANSITION_TIME
-from utils import resource_path
+from registry import Assets
+from prefetch import PokemonPrefetcher
+from backgrounds import BackgroundManager
+from audio import audio, KEYSTROKE, EFFECT, CRY, NAME_CALL
+from render import CachedLayer, DirtyRects, ScaleLadder, render_outlined_text, render_gradient_rect, render_rounded_rect
+from fonts import Fonts
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, NOT_SHOW_NAME_TIME, WHITE, BLACK, GREEN, AMBER, RED, GRAY, LIGHT_GRAY, COMBOCOLOR1, COMBOCOLOR2, GENS, FONTPATH, TRANSITION_TIME, ARROW_TRANSITION_TIME, DIRTY_RECTS, POKEMON_MAX_SCALE, BALL_MAX_SCALE, HALO_MAX_SCALE, JIGGLE_INTERVAL, WALK_INTERVAL
 
 pygame.mixer.init()
+audio.init()
 
-# Timer event IDs
-SPAWN_POKEMON_EVENT = pygame.USEREVENT + 1
-MESSAGE_CLEAR_EVENT = pygame.USEREVENT + 2
-SPECIAL_MESSAGE_CLEAR_EVENT = pygame.USEREVENT + 5
-TRANSITION_END_EVENT = pygame.USEREVENT + 6
-
-class GameSession:
+class GameSession(GameRules):
     PAUSE_OPTIONS = ["Resume", "Restart", "End Game"]
     END_OPTIONS = ["Restart", "Quit"]
+    pokemon_class = Pokemon
 
-    def __init__(self, pokemon_data, screen, font):
+    def __init__(self, pokemon_data, screen, font, clock=pygame.time.get_ticks, rng=None):
         self.screen = screen
         self.font = font
-        self.reset_game(pokemon_data)
+        self.dirty = DirtyRects(DIRTY_RECTS)
+        self.scores_layer = CachedLayer(self.update_scores_surface)
+        self.caught_pokemon_layer = CachedLayer(self.update_caught_pokemon_surface)
+
+        Sprites.load()
+
+        # Pre-scaled frames for the capture animation
+        self.ball_ladders = {ball: ScaleLadder(Assets.image(f"assets/balls/{ball}"), 1.0, BALL_MAX_SCALE)
+                             for ball in ["poke-ball.png", "great-ball.png", "ultra-ball.png", "master-ball.png"]}
+        self.halo_ladder = ScaleLadder(Assets.image("assets/balls/sticky-barb.png"), 1.0, HALO_MAX_SCALE)
+        self.prefetcher = PokemonPrefetcher()
+        self.backgrounds = BackgroundManager()
+        super().__init__(pokemon_data, clock, rng)
 
     def reset_game(self, pokemon_data):
-        self.elapsed_time = 0
-        self.game_paused = False
         self.selected_pause_option = 0
-        self.transitioning = False
-        self.game_ended = False
         self.selected_end_option = 0
-        self.paused_time_start = 0
-        self.total_paused_time = 0
-        self.pokemon_data = pokemon_data
-        self.caught_pokemon_count = 0
-        self.combo_count = 0
-        self.mistake_count = 0
-        self.total_mistake_count = 0
-        self.total_score = 0
-        self.current_pokemon = None
-        self.typed_name = ""
         self.animation_start_time = 0
         self.current_animating_char = ''
         self.is_correct = False
-        self.start_time = pygame.time.get_ticks()
-        self.caught_sound = pygame.mixer.Sound(resource_path('assets/sounds/paafekuto.ogg'))
-        self.miss_sound = pygame.mixer.Sound(resource_path('assets/sounds/daijoubu.ogg'))
-        self.keystroke_sound = pygame.mixer.Sound(resource_path('assets/sounds/clack.wav'))
+        self.caught_sound = audio.effect('assets/sounds/paafekuto.ogg')
+        self.miss_sound = audio.effect('assets/sounds/daijoubu.ogg')
+        self.keystroke_sound = audio.effect('assets/sounds/clack.wav')
         self.messages = []
-        self.special_message = {"text": "", "start_time": pygame.time.get_ticks()}
+        self.special_message = {"text": "", "start_time": self.get_ticks()}
         self.jiggle_offset = [0, 0]
-        self.ball_sprite = pygame.image.load(resource_path("assets/balls/poke-ball.png"))  # Load ball sprite
-        self.halo_effect = pygame.image.load(resource_path("assets/balls/sticky-barb.png"))  # Load halo effect sprite
+        self.ball_ladder = self.ball_ladders["poke-ball.png"]  # Ball sprite
         self.animation_state = "IDLE"  # Track the state of the animation
         self.ball_position = [0, 0]  # Initial ball position
         self.ball_target = [0, 0]  # Target position for the ball
         self.ball_start = [0, 0]  # Start position for the ball
         self.halo_visible = False
         self.halo_timer = 0
-        self.caught_pokemons = []
-        self.combo_indices = []
-        self.reward_map = REWARD_MAP
-        self.current_generation = 0
-        self.generations = []
-        self.current_level = 1
-        self.max_region_reached = GENS[self.current_generation]['name']
-        self.bg_image = pygame.image.load(resource_path(f"assets/background/{GENS[self.current_generation]['bg']}"))
-        self.caught_pokemon_surface = None
-        self.should_update_caught_pokemon_surface = True
-        pygame.mixer.music.load(resource_path(f"assets/music/{GENS[self.current_generation]['music']}"))
-        self.start_transition()
+        self.bg_image = self.backgrounds.get(0)
+        self.backgrounds.preload(0)
+        self.dirty.invalidate()
+        self.scores_layer.invalidate()
+        self.caught_pokemon_layer.invalidate()
+        audio.load_music(GENS[0]['music'])
+        self.preload_music(0)
+        super().reset_game(pokemon_data)
+        self.scheduler.schedule(JIGGLE_INTERVAL, self.jiggle_pokemon, repeat=True)
+        self.scheduler.schedule(WALK_INTERVAL, self.walk_pokemon, repeat=True)
+
+    def preload_music(self, generation):
+        """Read the music of the neighbouring regions, the end screen and a restart ahead of time."""
+        neighbours = GENS[max(0, generation - 1):generation + 2]
+        audio.preload_music(*[gen['music'] for gen in neighbours], "Score.mp3", GENS[0]['music'])
 
     def change_generation(self, new_generation):
-        self.bg_image = pygame.image.load(resource_path(f"assets/background/{GENS[new_generation]['bg']}"))
-        pygame.mixer.music.stop()
-        pygame.mixer.music.unload()
-        pygame.mixer.music.load(resource_path(f"assets/music/{GENS[new_generation]['music']}"))
+        self.bg_image = self.backgrounds.get(new_generation)
+        self.backgrounds.preload(new_generation)
+        self.dirty.invalidate()
+        audio.load_music(GENS[new_generation]['music'])
+        self.preload_music(new_generation)
         if new_generation > self.current_generation:
             self.add_message(f"Excellent! {GENS[new_generation]['name']} unlocked!", 5000)
-            self.max_region_reached = GENS[new_generation]['name']
         if new_generation == self.current_generation:
             self.add_message(f"Stay in {GENS[self.current_generation]['name']}.", 5000)
         if new_generation < self.current_generation:
             self.add_message(f"Move back to in {GENS[new_generation]['name']}.", 5000)
-        self.current_generation = new_generation
-        self.start_transition()
+        super().change_generation(new_generation)
 
     def start_transition(self):
-        if self.current_level > len(self.generations):
-            self.generations.append(self.current_generation)
-        self.pause_game(pygame.time.get_ticks(), False)
-        self.transition_start_time = pygame.time.get_ticks()
+        super().start_transition()
         pygame.mixer.music.play()
-        pygame.time.set_timer(TRANSITION_END_EVENT, TRANSITION_TIME, True)
+
+        # Load the first Pokemon of the region while the transition plays
+        self.prefetcher.prefetch(self.current_generation, self.create_pokemon, self.choose_pokemon_index())
 
     def display_region_transition(self):
         self.screen.blit(self.bg_image, (0, 0))
 
         # Adjust transition timing
-        transition_timer = pygame.time.get_ticks() - self.transition_start_time
+        transition_timer = self.get_ticks() - self.transition_start_time
         arrow_elapsed_time = min(transition_timer / (ARROW_TRANSITION_TIME / 2), 1)  # Arrow transition in the first half
         message_elapsed_time = min(transition_timer / ARROW_TRANSITION_TIME, 1)  # Message duration is the full time
 
@@ -131,7 +129,7 @@ class GameSession:
                 scale = 1.0  # No scaling
 
             scaled_font_size = int(self.font.get_height() * scale)
-            scaled_font = pygame.font.Font(resource_path(FONTPATH), scaled_font_size)
+            scaled_font = Fonts.get(FONTPATH, scaled_font_size)
 
             x = SCREEN_WIDTH // 2 - scaled_font.size(message)[0] // 2
             y = SCREEN_HEIGHT // 2 - scaled_font.size(message)[1] // 2
@@ -145,7 +143,7 @@ class GameSession:
             
             scale = max(1, 3.0 * (1 - 3 * normalised_time))  # Quickly Scale from 3.0 to 1.0
             scaled_font_size = int(self.font.get_height() * scale)
-            scaled_font = pygame.font.Font(resource_path(FONTPATH), scaled_font_size)
+            scaled_font = Fonts.get(FONTPATH, scaled_font_size)
             
             message = f"Welcome to {GENS[self.current_generation]['name']}!"
 
@@ -154,69 +152,53 @@ class GameSession:
 
             self.draw_text(self.screen, message, scaled_font, BLACK, x, y, outline_color=WHITE, outline_thickness=1)
 
+        # The whole screen changes during the transition
+        self.dirty.invalidate()
         pygame.display.flip()
 
 
-    def update_time(self, time):
-        if not self.game_paused:
-            self.elapsed_time = time - self.start_time - self.total_paused_time
-            if self.current_pokemon:
-                self.current_pokemon.elapsed_time = time - self.current_pokemon.start_time - self.current_pokemon.total_paused_time
-
-    def get_combo_reward(self, combo_count):
-        return self.reward_map.get(combo_count, 500*(combo_count-14))
-
-    def get_speed_multiplier(self, elapsed_time, time_limit):
-        percentage = elapsed_time / time_limit
-        if percentage <= 0.35:
-            return 1.5
-        elif percentage <= 0.55:
-            return 1.2
-        else:
-            return 1.0
-
-    def check_progress(self):
-        if self.caught_pokemon_count >=50:
-                self.end_game()
-        elif not self.current_level * 10 > self.caught_pokemon_count:
-            if self.caught_pokemon_count and self.caught_pokemon_count % 10 == 0:
-                legend_or_fast = np.array([x[1] or x[3] for x in self.caught_pokemons[-10:]]).sum()
-                legend_or_fast += np.array([x[2] for x in self.caught_pokemons[-10:]]).sum() / 2
-                self.current_level += 1
-                if (legend_or_fast >= PASS_MARK) and (self.mistake_count <= MAX_MISTAKE):
-                    self.change_generation(self.current_generation + 1)
-                if (legend_or_fast < PASS_MARK/2) or (self.mistake_count > 2* MAX_MISTAKE):
-                    self.change_generation(max(0, self.current_generation - 1))
-                else:
-                    self.change_generation(self.current_generation)
-                self.mistake_count = 0
-        else:
-            self.spawn_pokemon()
-
     def add_message(self, text, howlong=1000):
-        self.messages.append({"text": text, "start_time": pygame.time.get_ticks()})
-        pygame.time.set_timer(MESSAGE_CLEAR_EVENT, howlong, True)
+        # Each message goes away on its own timer
+        message = {"text": text, "start_time": self.get_ticks()}
+        self.messages.append(message)
+        self.scheduler.schedule(howlong, self.remove_message, message)
+
+    def remove_message(self, message):
+        if message in self.messages:
+            self.messages.remove(message)
 
     def add_special_message(self, text, howlong=1000):
         self.special_message["text"] = text
-        self.special_message["start_time"] = pygame.time.get_ticks()
-        pygame.time.set_timer(SPECIAL_MESSAGE_CLEAR_EVENT, howlong, True)
+        self.special_message["start_time"] = self.get_ticks()
+        self.scheduler.schedule(howlong, self.clear_special_message, key="special_message")
+
+    def clear_special_message(self):
+        self.special_message["text"] = ""
+
+    def jiggle_pokemon(self):
+        if self.current_pokemon and not self.game_ended:
+            self.jiggle_offset = self.jiggle()
+
+    def walk_pokemon(self):
+        if self.current_pokemon and not self.game_ended:
+            self.current_pokemon.walk()
 
     def display_special_message(self, screen, font, color, width, height):
-        current_time = pygame.time.get_ticks()
-        self.draw_text(screen, self.special_message["text"], font, color, (width - font.size(self.special_message["text"])[0] - 50) // 2, 70)
+        self.dirty.add(self.draw_text(screen, self.special_message["text"], font, color, (width - font.size(self.special_message["text"])[0] - 50) // 2, 70))
 
     def display_messages(self, screen, font, color, width):
-        current_time = pygame.time.get_ticks()
         for i, message in enumerate(self.messages[:]):
-            self.draw_text(screen, message["text"], font, color, width - font.size(message["text"])[0] - 50, 50 + i * 50)
+            self.dirty.add(self.draw_text(screen, message["text"], font, color, width - font.size(message["text"])[0] - 50, 50 + i * 50))
+
+    def next_pokemon(self):
+        return self.prefetcher.take(self.current_generation) or self.create_pokemon(self.choose_pokemon_index())
 
     def spawn_pokemon(self):
-        pokemon_data_choice = random.choice(self.pokemon_data[GENS[self.current_generation]["indices"][0]:GENS[self.current_generation]["indices"][1]])
-        self.current_pokemon = Pokemon(pokemon_data_choice)
-        self.caught_pokemon = None
-        self.typed_name = ""
-        self.current_pokemon.cry.play()
+        super().spawn_pokemon()
+
+        # Start loading the next one as soon as this one appears
+        self.prefetcher.prefetch(self.current_generation, self.create_pokemon, self.choose_pokemon_index())
+        audio.play(self.current_pokemon.cry, CRY)
 
     def start_capture_animation(self):
         self.animation_state = "PARABOLIC"
@@ -227,30 +209,17 @@ class GameSession:
         self.halo_timer = 0
 
     def pokemon_caught(self, elapsed_time):
-        self.current_pokemon.is_caught = True
-        self.current_pokemon.caught_time = elapsed_time
-        self.caught_pokemon_count += 1
-        self.combo_count += 1       
-
-        # Calculate score
-        base_score = self.get_combo_reward(self.combo_count)
-        if self.current_pokemon.legendary:
-            base_score = 10000
-        speed_multiplier = self.get_speed_multiplier(elapsed_time, self.current_pokemon.time_limit)
-        score = base_score * speed_multiplier
-        self.total_score += score
-        self.current_pokemon.is_fast = speed_multiplier == 1.2
-        self.current_pokemon.is_super_fast = speed_multiplier == 1.5
+        base_score, speed_multiplier = super().pokemon_caught(elapsed_time)
         
         # Start capture animation
         if self.current_pokemon.legendary:
-            self.ball_sprite = pygame.image.load(resource_path("assets/balls/master-ball.png"))
+            self.ball_ladder = self.ball_ladders["master-ball.png"]
         elif self.current_pokemon.is_super_fast:
-            self.ball_sprite = pygame.image.load(resource_path("assets/balls/ultra-ball.png"))
+            self.ball_ladder = self.ball_ladders["ultra-ball.png"]
         elif self.current_pokemon.is_fast:
-            self.ball_sprite = pygame.image.load(resource_path("assets/balls/great-ball.png"))
+            self.ball_ladder = self.ball_ladders["great-ball.png"]
         else:
-            self.ball_sprite = pygame.image.load(resource_path("assets/balls/poke-ball.png"))
+            self.ball_ladder = self.ball_ladders["poke-ball.png"]
         
         # Add messages
         if self.current_pokemon.legendary:
@@ -267,75 +236,44 @@ class GameSession:
         if self.combo_count > 3:
             self.add_message(f"Combo {self.combo_count}!")
 
-        self.current_pokemon.name_sound.play()
-        
-        self.caught_pokemon = self.current_pokemon.copy()
-        
-        # Add to caught Pokémon list
-        self.caught_pokemons.append((self.caught_pokemon.icon, 
-                                            self.caught_pokemon.legendary,
-                                            self.caught_pokemon.is_fast, 
-                                            self.caught_pokemon.is_super_fast))
-        self.should_update_caught_pokemon_surface = True
+        audio.play(self.current_pokemon.name_sound, NAME_CALL)
+        self.caught_pokemon_layer.invalidate()
         self.start_capture_animation()
-        
-        pygame.time.set_timer(SPAWN_POKEMON_EVENT, 1000, True)
 
     def pokemon_missed(self, wait_time_ms):
         self.add_message("Missed!")
-        if self.combo_count >= 3:
-            self.combo_indices.append((len(self.caught_pokemons) - self.combo_count, len(self.caught_pokemons)))
-        self.combo_count = 0
-        self.mistake_count += 1
-        self.total_mistake_count += 1
-        self.miss_sound.play()
-        self.current_pokemon = None
-        if self.mistake_count > MAX_MISTAKE:
-            self.end_game()
-        pygame.time.set_timer(SPAWN_POKEMON_EVENT, wait_time_ms, True)
+        audio.play(self.miss_sound, EFFECT)
+        super().pokemon_missed(wait_time_ms)
 
     def draw_pause_menu(self, screen, font):
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         overlay.fill(GRAY)
         overlay.set_alpha(150)  # Set transparency to 150
-        screen.blit(overlay, (0, 0))
+        self.dirty.add(screen.blit(overlay, (0, 0)))
 
         # Draw pause menu options
         menu_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 50, 250, 150)
-        self.draw_rounded_rect(screen, menu_rect, WHITE, radius=15, outline_color=BLACK)
+        self.dirty.add(self.draw_rounded_rect(screen, menu_rect, WHITE, radius=15, outline_color=BLACK))
 
         for i, option in enumerate(GameSession.PAUSE_OPTIONS):
             color = GREEN if i == self.selected_pause_option else BLACK
-            self.draw_text(screen, option, font, color, menu_rect.x + 50, menu_rect.y + 20 + i * 30)
+            self.dirty.add(self.draw_text(screen, option, font, color, menu_rect.x + 50, menu_rect.y + 20 + i * 30))
             
         self.draw_caught_pokemon_icons(screen)
 
     def pause_game(self, current_time, pause_music = True):
-        self.paused_time_start = current_time
+        super().pause_game(current_time, pause_music)
         if pause_music == True:
             pygame.mixer.music.pause()
-            self.game_paused = True
-        else:
-            self.transitioning = True
         
     def unpause_game(self, current_time, pause_music = True):
+        super().unpause_game(current_time, pause_music)
         if pause_music == True:
-            self.total_paused_time += current_time - self.paused_time_start
-            if self.current_pokemon:
-                self.current_pokemon.total_paused_time += current_time - self.paused_time_start
             pygame.mixer.music.unpause()
-            self.game_paused = False
-        else:
-            self.transitioning = False
 
     def end_game(self):
-        if self.combo_count >= 3:
-            self.combo_indices.append((len(self.caught_pokemons) - self.combo_count, len(self.caught_pokemons)))
-        self.current_pokemon = None
-        self.game_ended = True
-        pygame.mixer.music.stop()
-        pygame.mixer.music.unload()
-        pygame.mixer.music.load(resource_path(f"assets/music/Score.mp3"))
+        super().end_game()
+        audio.load_music("Score.mp3")
         pygame.mixer.music.play()
 
     def handle_pause_menu_input(self,event):
@@ -346,7 +284,7 @@ class GameSession:
                 self.selected_pause_option = (self.selected_pause_option + 1) % len(GameSession.PAUSE_OPTIONS)
             elif event.key == pygame.K_RETURN:
                 if GameSession.PAUSE_OPTIONS[self.selected_pause_option] == "Resume":
-                    self.unpause_game(pygame.time.get_ticks())
+                    self.unpause_game(self.get_ticks())
                 elif GameSession.PAUSE_OPTIONS[self.selected_pause_option] == "Restart":
                     self.reset_game(self.pokemon_data)
                 elif GameSession.PAUSE_OPTIONS[self.selected_pause_option] == "End Game":
@@ -356,22 +294,22 @@ class GameSession:
         """
         Set up the animation for the last typed letter.
         """
-        self.animation_start_time = pygame.time.get_ticks()
+        self.animation_start_time = self.get_ticks()
         self.current_animating_char = char
         self.is_correct = self.current_pokemon.name.startswith(self.typed_name)
-        self.keystroke_sound.play()
+        audio.play(self.keystroke_sound, KEYSTROKE)
 
     def animate_letter_appearance(self, screen, font, x, y, animation_duration=200):
         """
         Animate the appearance of the last typed letter with a "boom" effect.
         - animation_duration: Total duration of the animation (in milliseconds).
         """
-        elapsed = pygame.time.get_ticks() - self.animation_start_time
+        elapsed = self.get_ticks() - self.animation_start_time
         if elapsed > animation_duration:
             if self.is_correct:
                 # At the end of animation, correct letters stay as red
                 text_surface = font.render(self.current_animating_char, True, RED)
-                screen.blit(text_surface, (x, y))
+                self.dirty.add(screen.blit(text_surface, (x, y)))
             return  # Animation completed, no need to draw
 
         # Calculate the scale factor based on elapsed time
@@ -385,7 +323,7 @@ class GameSession:
 
         # Create a new font object with the scaled size
         scaled_font_size = int(font.get_height() * scale)
-        scaled_font = pygame.font.Font(resource_path(FONTPATH), scaled_font_size)
+        scaled_font = Fonts.get(FONTPATH, scaled_font_size)
 
         # Render the character with the scaled font
         text_surface = scaled_font.render(self.current_animating_char, True, BLACK)
@@ -394,7 +332,7 @@ class GameSession:
         new_x = x - (text_surface.get_width() - font.size(self.current_animating_char)[0]) // 2
         new_y = y - (text_surface.get_height() - font.size(self.current_animating_char)[1]) // 2
 
-        self.draw_text(screen, self.current_animating_char, scaled_font, BLACK, new_x, new_y)
+        self.dirty.add(self.draw_text(screen, self.current_animating_char, scaled_font, BLACK, new_x, new_y))
 
     def draw_game_elements(self, screen, font, elapsed_time, bg_image):
         if self.current_pokemon:
@@ -404,24 +342,19 @@ class GameSession:
             walk_x, walk_y = self.current_pokemon.walk_offset
 
             # Draw the Pokemon Background
-            screen.blit(self.current_pokemon.bg, (SCREEN_WIDTH - SCREEN_HEIGHT//2 - 50, SCREEN_HEIGHT// 2 -50))
+            self.dirty.add(screen.blit(self.current_pokemon.bg, (SCREEN_WIDTH - SCREEN_HEIGHT//2 - 50, SCREEN_HEIGHT// 2 -50)))
 
             # Draw the Pokemon sprite
-            max_pokemon_scale = 2.0
-            scale = 1 + (max_pokemon_scale - 1) * elapsed_time / self.current_pokemon.time_limit
+            scale = 1 + (POKEMON_MAX_SCALE - 1) * elapsed_time / self.current_pokemon.time_limit
 
-            # Calculate the scaled size of the ball
-            scaled_width = int(self.current_pokemon.sprite.get_width() * scale)
-            scaled_height = int(self.current_pokemon.sprite.get_height() * scale)
-            
-            # Scale the halo effect image
-            scaled_pokemon_sprite = pygame.transform.scale(self.current_pokemon.sprite, (scaled_width, scaled_height))
+            # Pick the pre-scaled sprite
+            scaled_pokemon_sprite = self.current_pokemon.sprite_ladder.at(scale)
 
             self.current_pokemon.current_position[0] = SCREEN_WIDTH // 2 - self.current_pokemon.sprite.get_width() // 2 + walk_x +  jiggle_x
             self.current_pokemon.current_position[1] = min(100 + walk_y + jiggle_y, 200)
             
             if not self.caught_pokemon or not self.caught_pokemon.ball_hit:
-                screen.blit(scaled_pokemon_sprite, self.current_pokemon.current_position)
+                self.dirty.add(screen.blit(scaled_pokemon_sprite, self.current_pokemon.current_position))
 
             # Draw the rounded rectangle around the Pokémon name and timer bar
             name_x = SCREEN_WIDTH // 2 - font.size(self.current_pokemon.name)[0] // 2
@@ -431,28 +364,28 @@ class GameSession:
             rect_height = name_height + 60  # Enough height to cover the name and timer bar
             rect_x = name_x - 10 + walk_x
             rect_y = 320
-            self.draw_rounded_rect(screen, pygame.Rect(rect_x, rect_y, rect_width, rect_height), LIGHT_GRAY, radius=15, outline_color=BLACK)
+            self.dirty.add(self.draw_rounded_rect(screen, pygame.Rect(rect_x, rect_y, rect_width, rect_height), LIGHT_GRAY, radius=15, outline_color=BLACK))
 
             # Draw the Pokemon name in full capital letters
             name_x = SCREEN_WIDTH // 2 - font.size(self.current_pokemon.name)[0] // 2
             if elapsed_time > NOT_SHOW_NAME_TIME or len(self.typed_name) > 0:
-                self.draw_text(screen, self.current_pokemon.name, font, BLACK, name_x + walk_x, rect_y + 20)
+                self.dirty.add(self.draw_text(screen, self.current_pokemon.name, font, BLACK, name_x + walk_x, rect_y + 20))
                 
                 # Draw the timer bar just below the typed name
                 time_to_draw = self.current_pokemon.caught_time if self.current_pokemon.is_caught else elapsed_time
-                self.draw_timer_bar(screen, name_x + walk_x, rect_y + name_height + 20, font.size(self.current_pokemon.name)[0], 15, time_to_draw, self.current_pokemon.time_limit)
+                self.dirty.add(self.draw_timer_bar(screen, name_x + walk_x, rect_y + name_height + 20, font.size(self.current_pokemon.name)[0], 15, time_to_draw, self.current_pokemon.time_limit))
 
             # Draw each typed letter exactly below each corresponding letter of the Pokemon name
             for i, char in enumerate(self.typed_name[:-1]):  # All typed letters except the last one
                 char_x = name_x + font.size(self.current_pokemon.name[:i])[0]
-                self.draw_text(screen, char, font, RED, char_x + walk_x, rect_y + 20)
+                self.dirty.add(self.draw_text(screen, char, font, RED, char_x + walk_x, rect_y + 20))
 
             # Animate the last typed letter
             if self.typed_name:
                 last_char_x = name_x + font.size(self.current_pokemon.name[:len(self.typed_name) - 1])[0]
                 self.animate_letter_appearance(screen, font, last_char_x + walk_x, rect_y + 20)
         else:
-            screen.blit(bg_image, (0, 0))
+            self.dirty.add(screen.blit(bg_image, (0, 0)))
 
     def get_target_position_in_array(self):
         x_start = 20
@@ -470,10 +403,10 @@ class GameSession:
         return x,y
 
     def update_caught_pokemon_surface(self):
-        # Create an off-screen surface with the same size as the caught Pokémon box
+        # Create an off-screen surface with the box around the caught Pokémon
         rect_width = 400
         rect_height = 200
-        self.caught_pokemon_surface = pygame.Surface((rect_width, rect_height), pygame.SRCALPHA)
+        caught_pokemon_surface = render_rounded_rect((rect_width, rect_height), WHITE, 15, BLACK, 2).copy()
         
         cols = 10
         icon_size = 32
@@ -503,7 +436,7 @@ class GameSession:
                 highlight_rect = pygame.Rect(x1, y + 2, x2 - x1, icon_size + 2)
 
                 # Draw gradient background
-                self.draw_gradient_rect(self.caught_pokemon_surface, highlight_rect, COMBOCOLOR1, COMBOCOLOR2)
+                self.draw_gradient_rect(caught_pokemon_surface, highlight_rect, COMBOCOLOR1, COMBOCOLOR2)
 
         for index, (icon, legendary, fast, superfast) in enumerate(self.caught_pokemons):
             col = index % cols
@@ -511,52 +444,44 @@ class GameSession:
             x = x_start + col * (icon_size + padding)
             y = y_start + row * (icon_size + padding)
 
-            self.caught_pokemon_surface.blit(icon, (x, y))
+            caught_pokemon_surface.blit(icon, (x, y))
 
             # Draw Legendary outline
             if legendary:
-                self.caught_pokemon_surface.blit(Sprites.masterball, (x + offset, y + offset))
+                caught_pokemon_surface.blit(Sprites.masterball, (x + offset, y + offset))
             elif superfast:
-                self.caught_pokemon_surface.blit(Sprites.ultraball, (x + offset, y + offset))
+                caught_pokemon_surface.blit(Sprites.ultraball, (x + offset, y + offset))
             elif fast:
-                self.caught_pokemon_surface.blit(Sprites.greatball, (x + offset, y + offset))
+                caught_pokemon_surface.blit(Sprites.greatball, (x + offset, y + offset))
             else:
-                self.caught_pokemon_surface.blit(Sprites.normalball, (x + offset, y + offset))
+                caught_pokemon_surface.blit(Sprites.normalball, (x + offset, y + offset))
 
-        self.should_update_caught_pokemon_surface = False
+        return caught_pokemon_surface
 
     def draw_caught_pokemon_icons(self, screen, rect_x=10, rect_y=SCREEN_HEIGHT - 210):
-        if self.should_update_caught_pokemon_surface:
-            self.update_caught_pokemon_surface()
-
-        # Draw the box around it
-        rect_width = 400  # Add some padding
-        rect_height = 200  # Enough height to cover the name and timer bar
-        self.draw_rounded_rect(screen, pygame.Rect(rect_x, rect_y, rect_width, rect_height), WHITE, radius=15, outline_color=BLACK)
-
-        # Blit the off-screen surface containing the caught Pokémon icons
-        screen.blit(self.caught_pokemon_surface, (rect_x, rect_y))
+        # Blit the off-screen surface containing the box and the caught Pokémon icons
+        self.dirty.add(screen.blit(self.caught_pokemon_layer.get(), (rect_x, rect_y)))
 
     def draw_end_screen(self,screen, font):
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         overlay.fill(GRAY)
         overlay.set_alpha(150)  # Set transparency to 150
-        screen.blit(overlay, (0, 0))
+        self.dirty.add(screen.blit(overlay, (0, 0)))
 
         # Draw box around 
         menu_rect = pygame.Rect(SCREEN_WIDTH // 2 - 300, SCREEN_HEIGHT // 2 - 250, 600, 550)
-        self.draw_rounded_rect(screen, menu_rect, WHITE, radius=15, outline_color=BLACK)
+        self.dirty.add(self.draw_rounded_rect(screen, menu_rect, WHITE, radius=15, outline_color=BLACK))
 
         # Display Stats
-        self.draw_text(screen, f"SCORE: {round(self.total_score):,}", font, BLACK, menu_rect.x + 50, menu_rect.y + 20 )
-        self.draw_text(screen, f"MISTAKES: {self.total_mistake_count}", font, BLACK, menu_rect.x + 50, menu_rect.y + 50 )
+        self.dirty.add(self.draw_text(screen, f"SCORE: {round(self.total_score):,}", font, BLACK, menu_rect.x + 50, menu_rect.y + 20 ))
+        self.dirty.add(self.draw_text(screen, f"MISTAKES: {self.total_mistake_count}", font, BLACK, menu_rect.x + 50, menu_rect.y + 50 ))
         max_combo_length = max(end - start for start, end in self.combo_indices) if self.combo_indices else 0
-        self.draw_text(screen, f"MAX COMBO: {max_combo_length}", font, BLACK, menu_rect.x + 50, menu_rect.y + 80 )
-        self.draw_text(screen, f"REACHED: {self.max_region_reached}", font, BLACK, menu_rect.x + 50, menu_rect.y + 110 )
+        self.dirty.add(self.draw_text(screen, f"MAX COMBO: {max_combo_length}", font, BLACK, menu_rect.x + 50, menu_rect.y + 80 ))
+        self.dirty.add(self.draw_text(screen, f"REACHED: {self.max_region_reached}", font, BLACK, menu_rect.x + 50, menu_rect.y + 110 ))
 
         for i, option in enumerate(GameSession.END_OPTIONS):
             color = GREEN if i == self.selected_end_option else BLACK
-            self.draw_text(screen, option, font, color, menu_rect.x + 250, menu_rect.y + 470 + i * 30)
+            self.dirty.add(self.draw_text(screen, option, font, color, menu_rect.x + 250, menu_rect.y + 470 + i * 30))
 
         # Draw the caught Pokémon icons
         self.draw_caught_pokemon_icons(screen , SCREEN_WIDTH // 2 - 200 , SCREEN_HEIGHT // 2 )
@@ -575,8 +500,9 @@ class GameSession:
                     exit()
 
 
-    def draw_game_scores(self, screen, font):
-        # Draw the score and combo count
+    def update_scores_surface(self, font):
+        # Draw the score and combo count on an off-screen surface laid out in screen coordinates
+        scores_surface = pygame.Surface((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2), pygame.SRCALPHA)
         font_height = font.size("Caught")[1]
         
         initial_spacing = 20
@@ -584,16 +510,26 @@ class GameSession:
         initial_spacing_icon = 25
         spacing_gap = 1.15
         
-        screen.blit(Sprites.pkbimg, (20, initial_spacing_icon))
-        self.draw_text(screen, f"Caught: {self.caught_pokemon_count}", font, BLACK, 50, initial_spacing)
-        screen.blit(Sprites.comboimg, (20, initial_spacing_icon + spacing_gap*font_height))
-        self.draw_text(screen, f"Combo: {self.combo_count}", font, BLACK, 50, initial_spacing + spacing)
-        screen.blit(Sprites.scoreimg, (20, initial_spacing_icon + 2*spacing_gap*font_height))
-        self.draw_text(screen, f"Score: {int(self.total_score):,}", font, BLACK, 50, initial_spacing + spacing * 2)
-        screen.blit(Sprites.mistakeimg, (20, initial_spacing_icon + 3*spacing_gap*font_height))
-        self.draw_text(screen, f"Mistakes: {int(self.mistake_count)} / {MAX_MISTAKE}", font, BLACK, 50, initial_spacing + spacing * 3)
-        screen.blit(Sprites.bikeimg, (20, initial_spacing_icon + 4*spacing_gap*font_height))
-        self.draw_text(screen, f"Region: {GENS[self.current_generation]['name']}", font, BLACK, 50, initial_spacing + spacing * 4)
+        scores_surface.blit(Sprites.pkbimg, (20, initial_spacing_icon))
+        self.draw_text(scores_surface, f"Caught: {self.caught_pokemon_count}", font, BLACK, 50, initial_spacing)
+        scores_surface.blit(Sprites.comboimg, (20, initial_spacing_icon + spacing_gap*font_height))
+        self.draw_text(scores_surface, f"Combo: {self.combo_count}", font, BLACK, 50, initial_spacing + spacing)
+        scores_surface.blit(Sprites.scoreimg, (20, initial_spacing_icon + 2*spacing_gap*font_height))
+        self.draw_text(scores_surface, f"Score: {int(self.total_score):,}", font, BLACK, 50, initial_spacing + spacing * 2)
+        scores_surface.blit(Sprites.mistakeimg, (20, initial_spacing_icon + 3*spacing_gap*font_height))
+        self.draw_text(scores_surface, f"Mistakes: {int(self.mistake_count)} / {self.max_mistake}", font, BLACK, 50, initial_spacing + spacing * 3)
+        scores_surface.blit(Sprites.bikeimg, (20, initial_spacing_icon + 4*spacing_gap*font_height))
+        self.draw_text(scores_surface, f"Region: {GENS[self.current_generation]['name']}", font, BLACK, 50, initial_spacing + spacing * 4)
+
+        # Only keep the part that was drawn on
+        bounding_rect = scores_surface.get_bounding_rect()
+        return scores_surface.subsurface(bounding_rect).copy(), bounding_rect.topleft
+
+    def draw_game_scores(self, screen, font):
+        # The scores are only redrawn when one of the values shown changes
+        key = (font, self.caught_pokemon_count, self.combo_count, int(self.total_score), int(self.mistake_count), self.current_generation)
+        scores_surface, position = self.scores_layer.get(key, font)
+        self.dirty.add(screen.blit(scores_surface, position))
     
     def update_capture_animation(self, screen):
         if self.animation_state == "PARABOLIC":
@@ -610,55 +546,45 @@ class GameSession:
                                      peak_height * (1 - (2 * x_fraction - 1) ** 2))
 
             # Calculate the scale
-            ball_scale_max = 4.0
-            scale = ball_scale_max - (ball_scale_max - 1) * ((self.ball_position[0] - self.ball_start[0])  / horizontal_distance)
+            scale = BALL_MAX_SCALE - (BALL_MAX_SCALE - 1) * ((self.ball_position[0] - self.ball_start[0])  / horizontal_distance)
 
-            # Calculate the scaled size of the ball
-            scaled_width = int(self.ball_sprite.get_width() * scale)
-            scaled_height = int(self.ball_sprite.get_height() * scale)
-            
-            # Scale the halo effect image
-            scaled_ball_sprite = pygame.transform.scale(self.ball_sprite, (scaled_width, scaled_height))
+            # Pick the pre-scaled ball
+            scaled_ball_sprite = self.ball_ladder.at(scale)
 
-            screen.blit(scaled_ball_sprite, self.ball_position)
+            self.dirty.add(screen.blit(scaled_ball_sprite, self.ball_position))
 
             # Check if the ball reached the target
             if abs(self.ball_position[0] - self.ball_target[0]) < 5:
                 if self.caught_pokemon:
                     self.caught_pokemon.ball_hit = True
                 self.animation_state = "HALO"
-                self.halo_timer = pygame.time.get_ticks()
+                self.halo_timer = self.get_ticks()
 
         elif self.animation_state == "HALO":
             # Calculate the time elapsed since the halo animation started
-            elapsed = pygame.time.get_ticks() - self.halo_timer
+            elapsed = self.get_ticks() - self.halo_timer
             halo_effect_duration = 300
             halo_offset_x = 40  # Example offset values
             halo_offset_y = 60
-            halo_scale_max = 7.0
             
             # Determine the scale factor (from 1.0 to 4.0 and back to 1.0)
             if elapsed <= halo_effect_duration / 2:
-                scale = 1.0 + (halo_scale_max - 1) * (elapsed / (halo_effect_duration/2))  # Expanding phase
+                scale = 1.0 + (HALO_MAX_SCALE - 1) * (elapsed / (halo_effect_duration/2))  # Expanding phase
             else:
-                scale = halo_scale_max - (halo_scale_max - 1) * ((elapsed - (halo_effect_duration/2)) / (halo_effect_duration/2))  # Shrinking phase
+                scale = HALO_MAX_SCALE - (HALO_MAX_SCALE - 1) * ((elapsed - (halo_effect_duration/2)) / (halo_effect_duration/2))  # Shrinking phase
 
             # Prevent scale from becoming negative
             scale = max(scale, 1.0)
             
-            # Calculate the scaled size of the halo effect
-            scaled_width = int(self.halo_effect.get_width() * scale)
-            scaled_height = int(self.halo_effect.get_height() * scale)
-            
-            # Scale the halo effect image
-            scaled_halo_effect = pygame.transform.scale(self.halo_effect, (scaled_width, scaled_height))
+            # Pick the pre-scaled halo effect
+            scaled_halo_effect = self.halo_ladder.at(scale)
             
             # Calculate the position to center the scaled halo at the ball's position with offset
             halo_x = self.ball_target[0] + halo_offset_x - scaled_halo_effect.get_width() // 2
             halo_y = self.ball_target[1] + halo_offset_y - scaled_halo_effect.get_height() // 2
             
             # Draw the halo effect
-            screen.blit(scaled_halo_effect, (halo_x, halo_y))
+            self.dirty.add(screen.blit(scaled_halo_effect, (halo_x, halo_y)))
     
             # Transition to the next state after the halo animation completes
             if elapsed > halo_effect_duration:
@@ -673,7 +599,7 @@ class GameSession:
             if self.ball_position[1] < self.ball_target[1]:
                 self.ball_position[1] += speed
 
-            screen.blit(self.ball_sprite, self.ball_position)
+            self.dirty.add(screen.blit(self.ball_ladder.at(1.0), self.ball_position))
 
             # Check if the ball reached the destination
             if (abs(self.ball_position[0] - self.ball_target[0]) < 5 and
@@ -685,7 +611,7 @@ class GameSession:
                 transparent_patch.fill((0, 0, 0, 0))  # Fill with transparent color
 
                 # Blit the transparent patch onto the screen at the desired position
-                screen.blit(transparent_patch, self.ball_position)
+                self.dirty.add(screen.blit(transparent_patch, self.ball_position))
     
     
     @staticmethod
@@ -693,15 +619,8 @@ class GameSession:
         """
         Draw text with an outline.
         """
-        # Draw outline
-        for dx in range(-outline_thickness, outline_thickness + 1):
-            for dy in range(-outline_thickness, outline_thickness + 1):
-                if dx != 0 or dy != 0:
-                    outline_surface = font.render(text, True, outline_color)
-                    screen.blit(outline_surface, (x + dx, y + dy))
-        
-        text_obj = font.render(text, True, color)
-        screen.blit(text_obj, (x, y))
+        text_surface = render_outlined_text(text, font, color, outline_color, outline_thickness)
+        return screen.blit(text_surface, (x - outline_thickness, y - outline_thickness))
 
     @staticmethod
     def draw_timer_bar(surface, x, y, width, height, elapsed_time, time_limit):
@@ -711,12 +630,12 @@ class GameSession:
         # Draw the white rounded rectangle as the background
         rounded_surface = pygame.Surface((width, height), pygame.SRCALPHA)
         pygame.draw.rect(rounded_surface, (255, 255, 255, 255), rounded_surface.get_rect(), border_radius=height // 2)
-        surface.blit(rounded_surface, (x, y))
+        background_rect = surface.blit(rounded_surface, (x, y))
         
         # Draw the colored filled bar on top of the white background
         filled_rect = pygame.Surface((fill_width, height), pygame.SRCALPHA)
         pygame.draw.rect(filled_rect, color, filled_rect.get_rect(), border_radius=height // 2)
-        surface.blit(filled_rect, (x, y))
+        return background_rect.union(surface.blit(filled_rect, (x, y)))
 
     @staticmethod
     def jiggle():
@@ -725,39 +644,11 @@ class GameSession:
     @staticmethod
     def draw_gradient_rect(surface, rect, color1, color2, radius=15):
         """Draw a vertical gradient rounded rectangle."""
-        gradient_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        for y in range(rect.height):
-            ratio = y / rect.height
-            color = (
-                int(color1[0] * (1 - ratio) + color2[0] * ratio),
-                int(color1[1] * (1 - ratio) + color2[1] * ratio),
-                int(color1[2] * (1 - ratio) + color2[2] * ratio)
-            )
-            pygame.draw.line(gradient_surface, color, (0, y), (rect.width, y))
-
-        # Create a rounded mask
-        mask_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(mask_surface, (255, 255, 255), mask_surface.get_rect(), border_radius=radius)
-        mask = pygame.mask.from_surface(mask_surface)
-
-        # Apply the mask to the gradient
-        rounded_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        for x in range(rect.width):
-            for y in range(rect.height):
-                if mask.get_at((x, y)):
-                    rounded_surface.set_at((x, y), gradient_surface.get_at((x, y)))
-
-        surface.blit(rounded_surface, rect.topleft)
+        rounded_surface = render_gradient_rect(rect.size, color1, color2, radius)
+        return surface.blit(rounded_surface, rect.topleft)
 
     @staticmethod
     def draw_rounded_rect(surface, rect, color, radius=15, outline_color=None, outline_width=2):
         """Draw a rounded rectangle with optional outline."""
-        rounded_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        
-        # Adjust the color to include 50% transparency
-        color_with_alpha = (*color, 128)  # Assuming color is (R, G, B)
-        
-        pygame.draw.rect(rounded_surface, color_with_alpha, rounded_surface.get_rect(), border_radius=radius)
-        if outline_color:
-            pygame.draw.rect(rounded_surface, outline_color, rounded_surface.get_rect(), outline_width, border_radius=radius)
-        surface.blit(rounded_surface, rect.topleft)
+        rounded_surface = render_rounded_rect(rect.size, color, radius, outline_color, outline_width)
+        return surface.blit(rounded_surface, rect.topleft)
@@ -1,9 +1,12 @@
 from setuptools import setup
 import os
+from config import ASSET_PACK_PATH
+from utils import bundled_asset_dirs
 
 def collect_assets():
     data_files = []
-    asset_dirs = ['data', 'assets/background', 'assets/music', 'assets/balls', 'assets/names', 'assets/sounds', 'assets/icons', 'assets/cries', 'assets/sprites', 'assets/font', 'assets/sugimori_mini']  # Add other asset directories here
+    # With an asset pack built, data holds every asset in data/assets.pack
+    asset_dirs = ['data'] if os.path.exists(ASSET_PACK_PATH) else ['data'] + bundled_asset_dirs()  # Add other asset directories to PACKED_ASSET_DIRS
     for directory in asset_dirs:
         for dirpath, _, filenames in os.walk(directory):
             for filename in filenames:
@@ -20,7 +23,7 @@ APP = ['main.py']  # Replace with your main script
 OPTIONS = {
     'argv_emulation': False,
     'packages': ['pygame', 'numpy'],
-    'includes': ['pokemon', 'session', 'config', 'sprites', 'utils'],  # Include other modules used
+    'includes': ['pokemon', 'session', 'config', 'sprites', 'utils', 'cache', 'sounds', 'prefetch', 'render', 'fonts', 'frames', 'rules', 'replay', 'profiler', 'pokedex', 'spawn', 'audio', 'registry', 'atlas', 'assetpack', 'backgrounds', 'scheduler'],  # Include other modules used
     'excludes': ['PyQt5', 'PySide2', 'tkinter','gi.repository', 'GstTag','packaging'],
     'plist': {
         'CFBundleName': 'Poke Typing',  # The name of the app
@@ -0,0 +1,246 @@
+"""
+Headless game simulation for balancing the difficulty knobs in config.py.
+
+    python simulation.py --sessions 10000 --output results.npz
+    python simulation.py --set pass_mark=6 --set normal_catch_time=8000
+"""
+import argparse
+import json
+import os
+import random
+import string
+import time
+import numpy as np
+from multiprocessing import Pool
+from rules import GameRules, PokemonState
+from pokedex import load_pokedex
+from config import GENS
+
+# Knobs set on the GameRules instance and on the PokemonState class
+RULE_KNOBS = ("pass_mark", "max_mistake", "reward_map", "legendary_weight", "avoid_recent")
+POKEMON_KNOBS = ("legendary_cutoff", "normal_catch_time", "legendary_catch_time")
+
+class TypingPlayer:
+    """
+    A model of how a player types a Pokemon name.
+    - keystroke_ms, keystroke_sd: Mean and spread of the time between two keystrokes.
+    - error_rate: Chance that any single keystroke is wrong.
+    - reaction_ms: Time before the first keystroke after a Pokemon appears.
+    - intervals: Recorded keystroke intervals in milliseconds, resampled instead of the normal model when given.
+    """
+    def __init__(self, keystroke_ms=300, keystroke_sd=100, error_rate=0.02, reaction_ms=800, intervals=None):
+        self.keystroke_ms = keystroke_ms
+        self.keystroke_sd = keystroke_sd
+        self.error_rate = error_rate
+        self.reaction_ms = reaction_ms
+        self.intervals = list(intervals) if intervals else None
+
+    def keystroke(self, rng):
+        if self.intervals:
+            return rng.choice(self.intervals)
+        return max(30, rng.gauss(self.keystroke_ms, self.keystroke_sd))
+
+    def attempt(self, name, rng):
+        """
+        Type a name. Returns the typed text and the time it took in milliseconds;
+        the text ends at the first wrong letter if there was one.
+        """
+        duration = self.reaction_ms
+        for i, letter in enumerate(name):
+            duration += self.keystroke(rng)
+            if rng.random() < self.error_rate:
+                wrong = rng.choice([c for c in string.ascii_uppercase if c != letter])
+                return name[:i] + wrong, duration
+        return name, duration
+
+
+class PlayerPopulation:
+    """
+    A distribution of TypingPlayers: mean keystroke time is log-normal around keystroke_ms,
+    error rate is beta distributed around error_rate.
+    - keystroke_spread: Sigma of the log-normal keystroke mean.
+    - error_concentration: Higher values keep the error rates closer to error_rate.
+    """
+    def __init__(self, keystroke_ms=300, keystroke_spread=0.3, error_rate=0.02, error_concentration=50, reaction_ms=800):
+        self.keystroke_ms = keystroke_ms
+        self.keystroke_spread = keystroke_spread
+        self.error_rate = error_rate
+        self.error_concentration = error_concentration
+        self.reaction_ms = reaction_ms
+
+    def sample(self, rng):
+        keystroke_ms = self.keystroke_ms * rng.lognormvariate(0, self.keystroke_spread)
+        error_rate = rng.betavariate(self.error_rate * self.error_concentration,
+                                     (1 - self.error_rate) * self.error_concentration)
+        return TypingPlayer(keystroke_ms, keystroke_ms / 3, error_rate, self.reaction_ms)
+
+
+class SimulatedRules(GameRules):
+    """
+    GameRules on a virtual clock, remembering when each region was first reached.
+    """
+    def __init__(self, pokemon_data, rng, **knobs):
+        self.now = 0
+        self.region_times = {0: 0}
+        for name in knobs:
+            if name not in RULE_KNOBS + POKEMON_KNOBS:
+                raise ValueError(f"Unknown knob: {name}")
+        for name in RULE_KNOBS:
+            if name in knobs:
+                setattr(self, name, knobs[name])
+        pokemon_knobs = {name: knobs[name] for name in POKEMON_KNOBS if name in knobs}
+        if pokemon_knobs:
+            self.pokemon_class = type("SimulatedPokemon", (PokemonState,), pokemon_knobs)
+        super().__init__(pokemon_data, lambda: self.now, rng)
+
+    def change_generation(self, new_generation):
+        self.region_times.setdefault(new_generation, self.now)
+        super().change_generation(new_generation)
+
+
+def simulate_session(pokemon_data, player, seed=None, max_time_ms=60 * 60 * 1000, **knobs):
+    """
+    Play one game to the end with a TypingPlayer. Extra keyword arguments override the
+    balance knobs in RULE_KNOBS and POKEMON_KNOBS.
+    """
+    rng = random.Random(seed)
+    game = SimulatedRules(pokemon_data, rng, **knobs)
+
+    while not game.game_ended and game.now < max_time_ms:
+        pokemon = game.current_pokemon
+        if pokemon and not pokemon.is_caught and not game.transitioning:
+            typed, duration = player.attempt(pokemon.name, rng)
+            if duration > pokemon.time_limit:
+                # The miss lands on the first frame past the time limit
+                game.now = pokemon.start_time + pokemon.time_limit + 1
+                game.update_time(game.now)
+                game.pokemon_missed(10)
+            else:
+                game.now = pokemon.start_time + int(duration)
+                game.update_time(game.now)
+                game.typed_name = typed
+                game.check_typed_name()
+        else:
+            next_time = game.next_timer_time()
+            if next_time is None:
+                break
+            game.now = max(game.now, next_time)
+            game.update_time(game.now)
+            game.run_timers(game.now)
+
+    return {
+        "seed": seed,
+        "score": game.total_score,
+        "caught": game.caught_pokemon_count,
+        "mistakes": game.total_mistake_count,
+        "ended": game.game_ended,
+        "duration": game.now,
+        "max_generation": max(game.region_times),
+        "region_times": game.region_times,
+    }
+
+
+# Pokemon data of a pool worker, loaded once by init_worker
+worker_data = None
+
+def init_worker():
+    global worker_data
+    worker_data = load_pokedex()
+
+def simulate_chunk(job):
+    """
+    Simulate one player per seed, each drawn from the population. Returns the results as arrays.
+    """
+    population, seeds, max_time_ms, knobs = job
+    count = len(seeds)
+    chunk = {
+        "score": np.zeros(count, np.float32),
+        "caught": np.zeros(count, np.int16),
+        "mistakes": np.zeros(count, np.int16),
+        "ended": np.zeros(count, bool),
+        "duration": np.zeros(count, np.int32),
+        "region_times": np.full((count, len(GENS)), np.nan, np.float32),
+    }
+    for i, seed in enumerate(seeds):
+        player = population.sample(random.Random(f"player-{seed}"))
+        result = simulate_session(worker_data, player, seed, max_time_ms, **knobs)
+        chunk["score"][i] = result["score"]
+        chunk["caught"][i] = result["caught"]
+        chunk["mistakes"][i] = result["mistakes"]
+        chunk["ended"][i] = result["ended"]
+        chunk["duration"][i] = result["duration"]
+        for generation, reach_time in result["region_times"].items():
+            chunk["region_times"][i, generation] = reach_time
+    return chunk
+
+def run_batch(population, sessions, seed=0, processes=None, max_time_ms=60 * 60 * 1000, **knobs):
+    """
+    Simulate many players across a process pool and concatenate their results.
+    """
+    processes = processes or os.cpu_count()
+    seeds = np.arange(seed, seed + sessions)
+    chunks = np.array_split(seeds, max(1, min(sessions, processes * 8)))
+    jobs = [(population, chunk.tolist(), max_time_ms, knobs) for chunk in chunks]
+    with Pool(processes, initializer=init_worker) as pool:
+        results = pool.map(simulate_chunk, jobs)
+    return {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+
+def summarize(results):
+    """
+    Score percentiles, how games end and how long each region takes to reach.
+    """
+    completed = results["caught"] >= 50
+    reached = ~np.isnan(results["region_times"])
+    minutes = results["region_times"] / 60000
+    return {
+        "sessions": len(results["score"]),
+        "score_percentiles": dict(zip((5, 25, 50, 75, 95), np.percentile(results["score"], (5, 25, 50, 75, 95)).round().tolist())),
+        "completed_rate": float(completed.mean()),
+        "game_over_rate": float((results["ended"] & ~completed).mean()),
+        "regions": [{
+            "name": gen["name"],
+            "reached_rate": float(reached[:, i].mean()),
+            "median_minutes": float(np.nanmedian(minutes[:, i])) if reached[:, i].any() else None,
+        } for i, gen in enumerate(GENS)],
+    }
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def parse_knob(text):
+    name, value = text.split("=", 1)
+    value = json.loads(value)
+    if name == "reward_map":
+        value = {int(combo): reward for combo, reward in value.items()}
+    return name, value
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Poke Typing games without a window.")
+    parser.add_argument("--sessions", type=positive_int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=positive_int, default=None)
+    parser.add_argument("--keystroke-ms", type=float, default=300)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--set", dest="knobs", action="append", type=parse_knob, default=[],
+                        metavar="KNOB=JSON", help=f"override one of {', '.join(RULE_KNOBS + POKEMON_KNOBS)}")
+    parser.add_argument("--output", help="save the per-session results to this .npz file")
+    args = parser.parse_args()
+
+    population = PlayerPopulation(keystroke_ms=args.keystroke_ms, error_rate=args.error_rate)
+    knobs = dict(args.knobs)
+
+    start = time.perf_counter()
+    results = run_batch(population, args.sessions, args.seed, args.processes, **knobs)
+    seconds = time.perf_counter() - start
+
+    summary = summarize(results)
+    print(f"{args.sessions} sessions in {seconds:.2f}s ({args.sessions / seconds:.0f}/s)")
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        np.savez_compressed(args.output, knobs=json.dumps(knobs), summary=json.dumps(summary), **results)
+
+if __name__ == "__main__":
+    main()
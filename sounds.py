@@ -0,0 +1,175 @@
+import pygame
+import json
+import os
+import shutil
+import struct
+import subprocess
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from utils import list_resources, open_resource
+from cache import LRUCache, sound_nbytes
+from config import NAME_SOUND_BUDGET, NAME_CALLS_DIR
+
+class NameSoundBank:
+    """
+    Name-call sounds indexed by Pokemon id and decoded just in time: request() starts decoding
+    a sound on a background thread and get() returns it, waiting only if it is still decoding.
+    Decoded sounds are kept in an LRU bounded by NAME_SOUND_BUDGET bytes.
+    """
+    def __init__(self, budget=NAME_SOUND_BUDGET):
+        self.paths = {}
+        self.sounds = LRUCache(budget, sound_nbytes)
+        self.pending = {}  # Id -> future of a sound being decoded
+        self.lock = threading.Lock()
+        self.decoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="names")
+
+    def load_manifest(self, manifest_path):
+        """Index the clips listed in a manifest written by build_name_calls."""
+        with open_resource(manifest_path) as file:
+            manifest = json.load(file)
+        folder = os.path.dirname(manifest_path)
+        self.paths = {int(id): os.path.join(folder, clip) for id, clip in manifest["clips"].items()}
+
+    def index(self, sounds_folder):
+        # Without a manifest, ids come from the "NNN - Name.wav" file names
+        for filename in sorted(list_resources(sounds_folder)):
+            if filename.endswith(".wav"):
+                id = int(filename.split('-')[0])
+                self.paths[id] = os.path.join(sounds_folder, filename)
+
+    def decode(self, id):
+        with open_resource(self.paths[id]) as file:
+            return self.sounds.put(id, pygame.mixer.Sound(file=file))
+
+    def request(self, id):
+        """Start decoding a sound in the background, unless it is decoded or decoding already."""
+        if id not in self.paths or id in self.sounds:
+            return
+        with self.lock:
+            if id in self.pending:
+                return
+            future = self.pending[id] = self.decoder.submit(self.decode, id)
+        # Outside the lock: the callback runs right away if the sound is already decoded
+        future.add_done_callback(lambda _: self.forget(id))
+
+    def forget(self, id):
+        with self.lock:
+            self.pending.pop(id, None)
+
+    def get(self, id, default=None):
+        sound = self.sounds.get(id)
+        if sound is None:
+            if id not in self.paths:
+                return default
+            with self.lock:
+                future = self.pending.get(id)
+            sound = future.result() if future else self.decode(id)
+        return sound
+
+    def __contains__(self, id):
+        return id in self.paths
+
+    def __len__(self):
+        return len(self.paths)
+
+
+# IMA ADPCM step sizes and step index changes per 4-bit code
+ADPCM_STEPS = [
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41, 45, 50, 55, 60, 66, 73, 80, 88, 97,
+    107, 118, 130, 143, 157, 173, 190, 209, 230, 253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724, 796,
+    876, 963, 1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749, 3024, 3327, 3660, 4026, 4428, 4871,
+    5358, 5894, 6484, 7132, 7845, 8630, 9493, 10442, 11487, 12635, 13899, 15289, 16818, 18500, 20350, 22385, 24623,
+    27086, 29794, 32767]
+ADPCM_INDEX_CHANGES = [-1, -1, -1, -1, 2, 4, 6, 8] * 2
+ADPCM_BLOCK_SIZE = 512
+
+def encode_ima_adpcm(samples, block_size=ADPCM_BLOCK_SIZE):
+    """
+    Encode 16-bit mono samples as IMA ADPCM blocks: 4 bits per sample, decoded natively by SDL.
+    SDL drops a partial last block, so the last block is padded with silence.
+    """
+    block_samples = (block_size - 4) * 2 + 1
+    samples = list(samples) or [0]
+    samples += [0] * (-len(samples) % block_samples)
+    encoded = bytearray()
+    index = 0
+    for start in range(0, len(samples), block_samples):
+        # Each block starts from an uncompressed sample and the running step index
+        predictor = samples[start]
+        encoded += struct.pack("<hBB", predictor, index, 0)
+        codes = []
+        for sample in samples[start + 1:start + block_samples]:
+            step = ADPCM_STEPS[index]
+            difference = sample - predictor
+            code = 0
+            if difference < 0:
+                code = 8
+                difference = -difference
+            delta = step >> 3
+            if difference >= step:
+                code |= 4
+                difference -= step
+                delta += step
+            step >>= 1
+            if difference >= step:
+                code |= 2
+                difference -= step
+                delta += step
+            step >>= 1
+            if difference >= step:
+                code |= 1
+                delta += step
+            predictor = max(-32768, min(32767, predictor - delta if code & 8 else predictor + delta))
+            index = max(0, min(88, index + ADPCM_INDEX_CHANGES[code]))
+            codes.append(code)
+        encoded += bytes(low | high << 4 for low, high in zip(codes[0::2], codes[1::2]))
+    return bytes(encoded)
+
+def write_ima_adpcm_wav(path, samples, rate, block_size=ADPCM_BLOCK_SIZE):
+    block_samples = (block_size - 4) * 2 + 1
+    data = encode_ima_adpcm(samples, block_size)
+    # Format tag 0x11, mono, 4 bits per sample, then the samples per block as the extra field
+    fmt = struct.pack("<HHIIHHHH", 0x11, 1, rate, rate * block_size // block_samples, block_size, 4, 2, block_samples)
+    # The real sample count, for decoders that cut the padding off
+    fact = struct.pack("<I", len(samples))
+    chunks = b"".join(name + struct.pack("<I", len(body)) + body
+                      for name, body in ((b"fmt ", fmt), (b"fact", fact), (b"data", data)))
+    with open(path, "wb") as file:
+        file.write(b"RIFF" + struct.pack("<I", 4 + len(chunks)) + b"WAVE" + chunks)
+
+
+def build_name_calls(source_folder, output_dir=NAME_CALLS_DIR, codec=None):
+    """
+    Transcode the "NNN - Name.wav" name calls to one compressed clip per Pokemon id, and write
+    the manifest NameSoundBank.load_manifest reads.
+    - codec: "ogg" (Vorbis, needs ffmpeg on the PATH) or "adpcm" (IMA ADPCM WAV, built in).
+      By default ogg when ffmpeg is available.
+    Returns the codec used and the number of clips.
+    """
+    codec = codec or ("ogg" if shutil.which("ffmpeg") else "adpcm")
+    # The same clip per id as NameSoundBank.index picks from the file names
+    sources = {}
+    for filename in sorted(os.listdir(source_folder)):
+        if filename.endswith(".wav"):
+            sources[int(filename.split('-')[0])] = os.path.join(source_folder, filename)
+
+    os.makedirs(output_dir, exist_ok=True)
+    clips = {}
+    for id, source in sources.items():
+        if codec == "ogg":
+            clips[id] = f"{id}.ogg"
+            subprocess.run(["ffmpeg", "-v", "error", "-y", "-i", source, "-c:a", "libvorbis", "-q:a", "3",
+                            os.path.join(output_dir, clips[id])], check=True)
+        else:
+            clips[id] = f"{id}.wav"
+            with wave.open(source) as clip:
+                if clip.getnchannels() != 1 or clip.getsampwidth() != 2:
+                    raise ValueError(f"{source} is not 16-bit mono")
+                samples = struct.unpack(f"<{clip.getnframes()}h", clip.readframes(clip.getnframes()))
+                rate = clip.getframerate()
+            write_ima_adpcm_wav(os.path.join(output_dir, clips[id]), samples, rate)
+
+    with open(os.path.join(output_dir, "manifest.json"), "w", encoding="utf-8") as file:
+        json.dump({"codec": codec, "clips": clips}, file)
+    return codec, len(clips)
@@ -0,0 +1,84 @@
+import numpy as np
+from pokedex import Pokedex, STATS
+from config import GENS, LEGENDARY_CUTOFF, NORMAL_POKEMON_CATCH_TIME, LEGENDARY_POKEMON_CATCH_TIME
+
+class AliasTable:
+    """
+    Walker's alias method: draws an index with probability proportional to its weight
+    in O(1), from two uniform numbers.
+    """
+    def __init__(self, weights):
+        weights = np.asarray(weights, float)
+        count = len(weights)
+        scaled = weights * count / weights.sum()
+        self.probability = np.ones(count)
+        self.alias = np.arange(count)
+
+        small = [i for i in range(count) if scaled[i] < 1]
+        large = [i for i in range(count) if scaled[i] >= 1]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1 - scaled[low]
+            (small if scaled[high] < 1 else large).append(high)
+
+        # Plain lists are faster to index from Python than NumPy arrays
+        self.probability = self.probability.tolist()
+        self.alias = self.alias.tolist()
+
+    def draw(self, rng):
+        i = int(rng.random() * len(self.alias))
+        return i if rng.random() < self.probability[i] else self.alias[i]
+
+
+class SpawnTable:
+    """
+    Spawn index built once per data load: base stat totals, legendary flags and time limits of
+    every Pokemon as arrays, and an alias table per generation for weighted draws.
+    - legendary_weight: How often a legendary is drawn compared to any other Pokemon (1 is uniform).
+    """
+    # Tables already built, by data, rarity knobs and weight
+    tables = {}
+
+    def __init__(self, pokemon_data, legendary_cutoff=LEGENDARY_CUTOFF, normal_catch_time=NORMAL_POKEMON_CATCH_TIME,
+                 legendary_catch_time=LEGENDARY_POKEMON_CATCH_TIME, legendary_weight=1.0, generations=GENS):
+        if isinstance(pokemon_data, Pokedex):
+            stats = pokemon_data.stats
+        else:
+            stats = np.array([[data["base"][stat] for stat in STATS] if "base" in data else [-1] * len(STATS)
+                              for data in pokemon_data])
+        self.data = pokemon_data
+        self.bst = stats.sum(axis=1, dtype=np.int32)
+        self.legendary = self.bst >= legendary_cutoff
+        self.time_limits = np.where(self.legendary, legendary_catch_time, normal_catch_time)
+        self.weights = np.where(self.legendary, legendary_weight, 1.0)
+        self.indices = []
+        self.aliases = []
+        for generation in generations:
+            self.add_generation(*generation["indices"])
+
+    @classmethod
+    def get(cls, pokemon_data, *knobs):
+        key = (id(pokemon_data),) + knobs
+        if key not in cls.tables:
+            cls.tables[key] = cls(pokemon_data, *knobs)
+        return cls.tables[key]
+
+    def add_generation(self, start, end):
+        """
+        Add a generation covering data[start:end], from the arrays already computed.
+        """
+        self.indices.append(list(range(start, end)))
+        self.aliases.append(AliasTable(self.weights[start:end]))
+
+    def draw(self, generation, rng, avoid=(), attempts=8):
+        """
+        Draw the index of a Pokemon of the generation, redrawing up to attempts times while it is in avoid.
+        """
+        indices, alias = self.indices[generation], self.aliases[generation]
+        for _ in range(attempts):
+            index = indices[alias.draw(rng)]
+            if index not in avoid:
+                break
+        return index
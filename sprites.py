@@ -1,13 +1,17 @@
-import pygame
-from utils import resource_path
+from registry import Assets
 
 class Sprites:
-    pkbimg = pygame.transform.scale(pygame.image.load(resource_path("assets/balls/poke-ball.png")), (30, 30))
-    scoreimg = pygame.transform.scale(pygame.image.load(resource_path("assets/balls/sapphire.png")), (25, 25))
-    comboimg = pygame.transform.scale(pygame.image.load(resource_path("assets/balls/shiny-stone.png")), (30, 30))
-    mistakeimg = pygame.transform.scale(pygame.image.load(resource_path("assets/balls/red-card.png")), (30, 30))
-    masterball = pygame.transform.scale(pygame.image.load(resource_path("assets/balls/master-ball.png")), (25, 25))
-    ultraball = pygame.transform.scale(pygame.image.load(resource_path("assets/balls/ultra-ball.png")), (25, 25))
-    greatball = pygame.transform.scale(pygame.image.load(resource_path("assets/balls/great-ball.png")), (25, 25))
-    normalball = pygame.transform.scale(pygame.image.load(resource_path("assets/balls/poke-ball.png")), (30, 30))
-    bikeimg = pygame.transform.scale(pygame.image.load(resource_path("assets/balls/bicycle.png")), (20, 20))
\ No newline at end of file
+    """
+    Small HUD images, taken from the asset registry once the display exists.
+    """
+    @classmethod
+    def load(cls):
+        cls.pkbimg = Assets.image("assets/balls/poke-ball.png", (30, 30))
+        cls.scoreimg = Assets.image("assets/balls/sapphire.png", (25, 25))
+        cls.comboimg = Assets.image("assets/balls/shiny-stone.png", (30, 30))
+        cls.mistakeimg = Assets.image("assets/balls/red-card.png", (30, 30))
+        cls.masterball = Assets.image("assets/balls/master-ball.png", (25, 25))
+        cls.ultraball = Assets.image("assets/balls/ultra-ball.png", (25, 25))
+        cls.greatball = Assets.image("assets/balls/great-ball.png", (25, 25))
+        cls.normalball = Assets.image("assets/balls/poke-ball.png", (30, 30))
+        cls.bikeimg = Assets.image("assets/balls/bicycle.png", (20, 20))
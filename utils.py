@@ -1,5 +1,7 @@
 import sys
 import os
+from assetpack import AssetPack
+from config import ASSET_PACK_PATH, PACKED_ASSET_DIRS, NAME_CALLS_DIR
 
 def resource_path(relative_path):
     try:
@@ -7,5 +9,42 @@ def resource_path(relative_path):
         base_path = sys._MEIPASS
     except Exception:
         base_path = os.path.abspath(".")
-        
-    return os.path.join(base_path, relative_path)
\ No newline at end of file
+
+    return os.path.join(base_path, relative_path)
+
+def asset_pack():
+    """The asset pack built by build_assets.py, or None when assets are loose files."""
+    return AssetPack.shared(resource_path(ASSET_PACK_PATH))
+
+def open_resource(relative_path):
+    """
+    Binary file object of an asset: a view into the asset pack when it has the file, else the file itself.
+    """
+    name = relative_path.replace(os.sep, "/")
+    pack = asset_pack()
+    if pack is not None and name in pack:
+        return pack.open(name)
+    return open(resource_path(relative_path), "rb")
+
+def resource_exists(relative_path):
+    pack = asset_pack()
+    if pack is not None and relative_path.replace(os.sep, "/") in pack:
+        return True
+    return os.path.exists(resource_path(relative_path))
+
+def list_resources(relative_dir):
+    """File names in an asset directory, from the asset pack when it has the directory."""
+    pack = asset_pack()
+    names = pack.listdir(relative_dir.replace(os.sep, "/")) if pack is not None else []
+    if not names and os.path.isdir(resource_path(relative_dir)):
+        names = os.listdir(resource_path(relative_dir))
+    return names
+
+def bundled_asset_dirs():
+    """
+    Asset directories to pack or ship. The name-call WAVs are left out once they are transcoded.
+    """
+    directories = PACKED_ASSET_DIRS
+    if os.path.exists(os.path.join(NAME_CALLS_DIR, "manifest.json")):
+        directories = [directory for directory in directories if directory != "assets/names"]
+    return directories